@@ -2,29 +2,103 @@
 import random
 
 from app import logic
-from app.ai import alphabeta, montecarlo, qlearning  # Importar tus modulos
+
+# Importar tus modulos
+from app.ai import alphabeta, book, montecarlo, ponder, qlearning
+from app.ai.measure import measure_performance
+from app.ai.search_cache import search_cache
+from app.ai.stats import SearchStats
 from app.models import AIAlgorithm
-from app.utils import measure_performance
+
+# Motores de búsqueda (los que usan libro, estado por partida y pondering)
+ENGINES = {AIAlgorithm.ALPHABETA: alphabeta, AIAlgorithm.MONTECARLO: montecarlo}
 
 
 @measure_performance
-def select_best_move(board, player, algorithm: AIAlgorithm, parameters: dict):
+def select_best_move(
+    board,
+    player,
+    algorithm: AIAlgorithm,
+    parameters: dict,
+    game_id=None,
+    stats: SearchStats | None = None,
+):
     """
-    Función fachada que redirige al algoritmo correcto
+    Función fachada que redirige al algoritmo correcto.
+    Alphabeta y montecarlo consultan antes el libro de aperturas (salvo con
+    ``use_book`` a False). Con ``game_id`` el motor reutiliza lo que calculó
+    en su jugada anterior de la misma partida (ver search_cache) y lo que haya
+    pensado mientras el humano decidía (ver ponder).
+    Si se pasa ``stats`` (SearchStats) se rellena con lo que costó decidir.
     """
+    if stats is None:
+        stats = SearchStats()
     valid_moves = logic.get_valid_moves(board, player)
     if not valid_moves:
         return None
 
+    # Lo primero es parar el pondering de la partida (aunque la jugada salga
+    # del libro), para que no siga gastando CPU en segundo plano
+    pondered = None
+    pondered_stats = SearchStats()
+    if game_id is not None:
+        pondered = ponder.take_move(game_id, board, player, parameters, pondered_stats)
+
+    if algorithm in ENGINES and parameters.get("use_book", True):
+        book_move = book.lookup(board, player)
+        if book_move is not None:
+            stats.source = "book"
+            return book_move
+
+    if pondered is not None:
+        stats.update(pondered_stats)
+        return pondered
+
     if algorithm == AIAlgorithm.RANDOM:
+        stats.source = "random"
         return random.choice(valid_moves)
     elif algorithm == AIAlgorithm.ALPHABETA:
-        return alphabeta.get_move(board, player, parameters)
+        return _get_move_with_state(
+            alphabeta, board, player, parameters, game_id, stats
+        )
 
     elif algorithm == AIAlgorithm.MONTECARLO:
-        return montecarlo.get_move(board, player, parameters)
+        return _get_move_with_state(
+            montecarlo, board, player, parameters, game_id, stats
+        )
 
     elif algorithm == AIAlgorithm.QLEARNING:
+        stats.source = "qlearning"
         return qlearning.get_move(board, player, parameters)
 
     return None
+
+
+def _get_move_with_state(engine, board, player, parameters, game_id, stats):
+    """Llama a engine.get_move con el SearchState guardado de esta partida."""
+    if game_id is None:
+        return engine.get_move(board, player, parameters, stats=stats)
+
+    key = (game_id, player)
+    state = search_cache.take(key)
+    if not isinstance(state, engine.SearchState):
+        state = engine.SearchState()
+    move = engine.get_move(board, player, parameters, state, stats=stats)
+    search_cache.put(key, state)
+    return move
+
+
+def start_pondering(game_id, board, human, algorithm: AIAlgorithm, parameters):
+    """
+    Si el bot tiene ``ponder`` activado, empieza a calcular sus respuestas a
+    las jugadas del humano mientras este piensa.
+    """
+    engine = ENGINES.get(algorithm)
+    if engine is not None and parameters.get("ponder"):
+        ponder.start(game_id, engine, board, human, parameters)
+
+
+def forget_game(game_id):
+    """La partida terminó: se descarta todo lo guardado para ella."""
+    ponder.cancel(game_id)
+    search_cache.discard_game(game_id)
@@ -1,18 +1,259 @@
+import atexit
+import itertools
 import math
+import multiprocessing
 import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
 
-from app import logic
+from app import bitboard, logic
+from app.ai import endgame, heuristics, patterns, stability
+from app.ai.eval_cache import search_eval_cache
 
 # Importamos las funciones de evaluación separadas
-from app.ai.heuristics import evaluate_board, evaluate_end_game
+from app.ai.heuristics import SQUARE_WEIGHTS, evaluate_end_position, evaluate_position
+from app.ai.stats import SearchStats
+from app.ai.transposition import (
+    ENTRY_BYTES,
+    EXACT,
+    LOWER,
+    NO_MOVE,
+    UPPER,
+    SharedTranspositionTable,
+    TranspositionTable,
+    code_fingerprint,
+    shared_table_name,
+)
+from app.core.config import settings
 
+# Cada cuántos nodos se consulta el reloj durante la búsqueda
+TIME_CHECK_INTERVAL = 1024
 
-def get_move(board, player, parameters: dict):
+# A partir de esta profundidad restante la ordenación también mira cuántas
+# respuestas le dejamos al rival (cuesta una generación de jugadas por hijo)
+MOBILITY_ORDERING_DEPTH = 3
+
+MAX_PLY = 64
+
+# Búsquedas paralelas que pueden estar en marcha a la vez en este proceso
+# (cada una ocupa un hueco del array compartido de alphas)
+MAX_PARALLEL_SEARCHES = 32
+
+# Prefijo de los bloques de memoria compartida (uno por heurística)
+SHARED_TT_PREFIX = "reversi_tt"
+
+# Versión del código que puntúa las entradas de la tabla compartida: si cambia
+# (heurísticas, tablas, la propia búsqueda), las entradas que queden en un
+# bloque de antes no valen y se vacía
+EVAL_VERSION = code_fingerprint(
+    bitboard, logic, heuristics, patterns, stability, sys.modules[__name__]
+)
+
+
+class SearchTimeout(Exception):
+    """Se agotó el tiempo: la iteración en curso se descarta."""
+
+
+class SearchContext:
+    """
+    Estado compartido por todos los nodos de una búsqueda.
+    """
+
+    __slots__ = (
+        "heuristic_type",
+        "tt",
+        "use_sorting",
+        "use_pvs",
+        "killers",
+        "history",
+        "deadline",
+        "stop",
+        "nodes",
+        "leaf_evals",
+        "tt_hits",
+        "cutoffs",
+        "first_move_cutoffs",
+        "evals",
+        "eval_cache_hits",
+        "eval_cache_misses",
+    )
+
+    def __init__(
+        self, heuristic_type, tt=None, use_sorting=True, use_pvs=False, evals=None
+    ):
+        self.heuristic_type = heuristic_type
+        self.tt = tt
+        self.evals = evals  # EvalCache o None (se evalúa siempre)
+        self.use_sorting = use_sorting
+        self.use_pvs = use_pvs
+        # Jugadas "killer": las dos últimas que provocaron corte en cada ply
+        self.killers = [[NO_MOVE, NO_MOVE] for _ in range(MAX_PLY)]
+        # Historia: cuánto ha cortado cada casilla en cualquier parte del árbol
+        self.history = [0] * 64
+        self.deadline = None  # time.perf_counter() límite, None = sin límite
+        self.stop = None  # threading.Event para cortar desde fuera (ponder)
+        # Contadores para SearchStats
+        self.nodes = 0
+        self.leaf_evals = 0
+        self.tt_hits = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        # Aciertos y fallos de la caché de evaluaciones de otros procesos (los
+        # de esta búsqueda los lleva ``evals``)
+        self.eval_cache_hits = 0
+        self.eval_cache_misses = 0
+
+    def out_of_time(self):
+        if self.stop is not None and self.stop.is_set():
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def counters(self):
+        eval_cache_hits = self.eval_cache_hits
+        eval_cache_misses = self.eval_cache_misses
+        if self.evals is not None:
+            eval_cache_hits += self.evals.hits
+            eval_cache_misses += self.evals.misses
+        return (
+            self.nodes,
+            self.leaf_evals,
+            self.tt_hits,
+            self.cutoffs,
+            self.first_move_cutoffs,
+            eval_cache_hits,
+            eval_cache_misses,
+        )
+
+    def add_counters(self, counters):
+        """Suma los contadores de otra búsqueda (un proceso del pool)."""
+        (
+            nodes,
+            leaf_evals,
+            tt_hits,
+            cutoffs,
+            first_move_cutoffs,
+            eval_cache_hits,
+            eval_cache_misses,
+        ) = counters
+        self.nodes += nodes
+        self.leaf_evals += leaf_evals
+        self.tt_hits += tt_hits
+        self.cutoffs += cutoffs
+        self.first_move_cutoffs += first_move_cutoffs
+        self.eval_cache_hits += eval_cache_hits
+        self.eval_cache_misses += eval_cache_misses
+
+    def fill_stats(self, stats: SearchStats):
+        (
+            nodes,
+            leaf_evals,
+            tt_hits,
+            cutoffs,
+            first_move_cutoffs,
+            eval_cache_hits,
+            eval_cache_misses,
+        ) = self.counters()
+        stats.nodes += nodes
+        stats.leaf_evals += leaf_evals
+        stats.tt_hits += tt_hits
+        stats.cutoffs += cutoffs
+        stats.first_move_cutoffs += first_move_cutoffs
+        stats.eval_cache_hits += eval_cache_hits
+        stats.eval_cache_misses += eval_cache_misses
+
+    def age_history(self):
+        """Entre iteraciones: la historia reciente pesa más que la antigua."""
+        self.history = [h >> 1 for h in self.history]
+
+    def record_cutoff(self, sq, depth, ply):
+        killers = self.killers[ply]
+        if killers[0] != sq:
+            killers[1] = killers[0]
+            killers[0] = sq
+        self.history[sq] += depth * depth
+
+
+class SearchState:
     """
-    Punto de entrada del algoritmo Alpha-Beta.
+    Lo que una búsqueda deja a la siguiente de la misma partida (o, en los
+    procesos del pool, a la siguiente tarea): la tabla de transposición y la
+    caché de evaluaciones. Sus entradas solo dependen de la posición, la
+    profundidad y la heurística, así que siguen valiendo aunque la raíz sea otra.
+    """
+
+    __slots__ = ("key", "tt", "evals")
+
+    def __init__(self):
+        self.key = None  # (heurística, MB) con que se creó la tabla
+        self.tt = None
+        self.evals = None
+
+    def nbytes(self):
+        size = 0 if self.tt is None else (self.tt.mask + 1) * ENTRY_BYTES
+        if self.evals is not None:
+            size += self.evals.nbytes()
+        return size
+
+    def table(self, heuristic_type, tt_size_mb):
+        """La tabla guardada si sirve para esta búsqueda; si no, una nueva."""
+        if self.key != (heuristic_type, tt_size_mb):
+            self.key = (heuristic_type, tt_size_mb)
+            self.tt = TranspositionTable(tt_size_mb)
+        self.tt.new_search()
+        return self.tt
+
+
+_shared_tables = {}
+_shared_tables_lock = threading.Lock()
+
+
+def _shared_tt(heuristic_type):
+    """
+    Tabla de transposición compartida entre procesos para esta heurística, o
+    None si no está activada (settings.SHARED_TT_MB = 0).
+    """
+    if not settings.SHARED_TT_MB:
+        return None
+    name = shared_table_name(SHARED_TT_PREFIX, heuristic_type)
+    with _shared_tables_lock:
+        tt = _shared_tables.get(name)
+        if tt is None:
+            tt = SharedTranspositionTable(name, settings.SHARED_TT_MB, EVAL_VERSION)
+            _shared_tables[name] = tt
+            atexit.register(tt.close)
+    tt.new_search()
+    return tt
+
+
+def get_move(
+    board,
+    player,
+    parameters: dict,
+    state: SearchState | None = None,
+    stop: threading.Event | None = None,
+    stats: SearchStats | None = None,
+):
+    """
+    Punto de entrada del algoritmo Alpha-Beta. Si se pasa ``state`` se
+    reutiliza la tabla de transposición de la jugada anterior. ``stop`` corta
+    la búsqueda en cuanto se activa (se queda la última iteración completa).
+    ``stats`` se rellena con los contadores de la búsqueda.
     """
     depth = parameters.get("depth", 3)
     heuristic_type = parameters.get("heuristic", "static_weights")
+    # Una tabla por búsqueda: con un límite, que la pide cada petición
+    tt_size_mb = min(parameters.get("tt_size_mb", 16), settings.MAX_TT_MB)
+    use_sorting = parameters.get("use_sorting", True)
+    use_pvs = parameters.get("use_pvs", False)
+    aspiration_window = parameters.get("aspiration_window", 0) if use_pvs else 0
+    time_limit_ms = parameters.get("time_limit_ms")
+    endgame_empties = parameters.get("endgame_empties", 12)
+    parallel_workers = parameters.get("parallel_workers", 0)
+    start_time = time.perf_counter()
 
     valid_moves = logic.get_valid_moves(board, player)
 
@@ -22,97 +263,496 @@ def get_move(board, player, parameters: dict):
     if len(valid_moves) == 1:
         return valid_moves[0]
 
+    # Una sola posición que se modifica en sitio durante toda la búsqueda
+    pos = logic.Position.from_board(board, player)
+
+    # --- FINAL EXACTO ---
+    # Con pocas casillas libres buscamos hasta el final. Si no le da tiempo,
+    # seguimos con la búsqueda normal (su primera iteración nunca se corta).
+    if pos.empties() <= endgame_empties:
+        deadline = start_time + time_limit_ms / 1000 if time_limit_ms else None
+        result = endgame.solve(pos, deadline, stop, stats)
+        if result is not None and result.move != NO_MOVE:
+            if stats is not None:
+                stats.search_time = time.perf_counter() - start_time
+            return bitboard.to_coords(result.move)
+        if result is None:
+            # El final se ha comido el tiempo: nos quedamos con la profundidad 1
+            # (la primera iteración no se corta, pero es casi instantánea) y
+            # sin crear una tabla nueva, que para eso no sirve y tarda en crearse
+            depth = 1
+            tt_size_mb = 0
+
+    tt = _shared_tt(heuristic_type)
+    if tt is None and tt_size_mb:
+        if state is None:
+            tt = TranspositionTable(tt_size_mb)
+        else:
+            tt = state.table(heuristic_type, tt_size_mb)
+    ctx = SearchContext(
+        heuristic_type, tt, use_sorting, use_pvs, search_eval_cache(state)
+    )
+    ctx.stop = stop
+
+    best_move = random.choice(valid_moves)
+    best_sq = NO_MOVE
+    best_score = None
+
+    # --- PROFUNDIZACIÓN ITERATIVA ---
+    # Buscamos a profundidad 1, 2, 3... y nos quedamos con la mejor jugada de
+    # la última iteración completa. La primera iteración nunca se corta.
+    for current_depth in range(1, depth + 1):
+        ctx.age_history()
+        try:
+            if parallel_workers > 1 and current_depth >= 2:
+                # La primera iteración es inmediata; desde la segunda se
+                # reparten las jugadas de la raíz
+                sq, score = _search_root_parallel(
+                    pos, current_depth, ctx, best_sq, parallel_workers, tt_size_mb
+                )
+            elif aspiration_window and best_score is not None:
+                # Ventana de aspiración alrededor de la puntuación anterior;
+                # si el resultado cae fuera, se repite con ventana completa.
+                alpha = best_score - aspiration_window
+                beta = best_score + aspiration_window
+                sq, score = _search_root(pos, current_depth, ctx, best_sq, alpha, beta)
+                if score <= alpha or score >= beta:
+                    sq, score = _search_root(pos, current_depth, ctx, best_sq)
+            else:
+                sq, score = _search_root(pos, current_depth, ctx, best_sq)
+        except SearchTimeout:
+            break
+        best_sq, best_score = sq, score
+        if stats is not None:
+            stats.depth_completed = current_depth
+        if time_limit_ms:
+            ctx.deadline = start_time + time_limit_ms / 1000
+        if ctx.out_of_time():
+            break
+
+    if stats is not None:
+        ctx.fill_stats(stats)
+        stats.search_time = time.perf_counter() - start_time
+    if best_sq != NO_MOVE:
+        best_move = bitboard.to_coords(best_sq)
+    return best_move
+
+
+def _search_root(pos, depth, ctx, first_move=NO_MOVE, alpha=-math.inf, beta=math.inf):
+    """
+    Busca todas las jugadas de la raíz y devuelve (mejor casilla, puntuación).
+    ``first_move`` (la mejor de la iteración anterior) se busca primero.
+    Si la puntuación queda fuera de (alpha, beta) solo es una cota.
+    """
     # Configuración inicial de Alpha-Beta
     best_score = -math.inf
-    best_move = random.choice(valid_moves)
-    alpha = -math.inf
-    beta = math.inf
+    best_sq = NO_MOVE
+    alpha_orig = alpha
+
+    tt_move = first_move
+    if tt_move == NO_MOVE and ctx.tt is not None:
+        entry = ctx.tt.probe(pos.hash)
+        if entry is not None:
+            tt_move = entry[3]
 
-    for move in valid_moves:
+    moves = _ordered_moves(pos, logic.legal_moves(pos), tt_move, depth, 0, ctx)
+    for i, sq in enumerate(moves):
         # Generar siguiente estado
-        sim_result = logic.apply_move(board, move[0], move[1], player)
-        new_board = sim_result.board_state
+        undo = logic.make_move(pos, sq)
 
-        # Llamada recursiva (cambio de turno -> minimizar)
-        score = _minimax(
-            new_board, depth - 1, alpha, beta, False, player, heuristic_type
-        )
+        # Llamada recursiva (cambio de turno -> puntuación negada)
+        score = _search_child(pos, depth, 0, alpha, beta, ctx, i == 0)
+
+        logic.unmake_move(pos, undo)
 
         if score > best_score:
             best_score = score
-            best_move = move
+            best_sq = sq
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
 
-        alpha = max(alpha, score)
+    exact = alpha_orig < best_score < beta
+    if ctx.tt is not None and best_sq != NO_MOVE and exact:
+        ctx.tt.store(pos.hash, depth, best_score, EXACT, best_sq)
+    return best_sq, best_score
+
+
+# --- BÚSQUEDA PARALELA EN LA RAÍZ ---
+# La primera jugada de la raíz se busca aquí con ventana completa y el resto se
+# reparte entre procesos. Cada proceso lee la mejor puntuación conocida (alpha
+# compartido) y busca su jugada con ventana (alpha - 1, inf): si el resultado
+# es >= alpha es exacto, si no, la jugada es estrictamente peor que otra.
+# Como en serie, gana la primera jugada (en orden de búsqueda) con la máxima
+# puntuación exacta, así que la elección no depende de qué proceso acabe antes.
+#
+# Cada búsqueda en curso ocupa un hueco de los arrays compartidos: su alpha y
+# el id de la búsqueda dueña del hueco. Al soltarlo el id pasa a 0, y los
+# procesos que sigan con jugadas de esa búsqueda lo ven y paran (así también
+# llega la parada del ponder, que es un threading.Event de este proceso).
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+# Búsquedas usando cada pool: si uno se sustituye por otro con más procesos,
+# el viejo se cierra cuando lo suelta la última búsqueda que lo estaba usando
+_pool_users = {}
+_shared_alphas = None  # multiprocessing.Array, un hueco por búsqueda en curso
+_shared_searches = None  # Id de la búsqueda dueña de cada hueco (0 = libre)
+_free_slots = []
+_search_ids = itertools.count(1)
+# Los mismos arrays, vistos desde los procesos del pool
+_worker_alphas = None
+_worker_searches = None
+# Sin tabla compartida, cada proceso del pool reutiliza la suya entre tareas
+_worker_state = SearchState()
 
-    return best_move
 
+def _init_worker(alphas, searches):
+    global _worker_alphas, _worker_searches
+    _worker_alphas = alphas
+    _worker_searches = searches
 
-def _minimax(board, depth, alpha, beta, is_maximizing, my_player_id, heuristic_type):
+
+def _acquire_slot(workers):
+    """
+    Devuelve (pool, hueco, id de búsqueda) o (None, None, None) si no quedan
+    huecos libres. Hay que devolverlo con _release_slot.
+    """
+    global _pool, _pool_workers, _shared_alphas, _shared_searches
+    with _pool_lock:
+        if _pool is None or _pool_workers < workers:
+            # "spawn": el backend tiene hilos y hacer fork con hilos no es seguro
+            mp = multiprocessing.get_context("spawn")
+            if _shared_alphas is None:
+                _shared_alphas = mp.Array("q", MAX_PARALLEL_SEARCHES)
+                _shared_searches = mp.Array("q", MAX_PARALLEL_SEARCHES)
+                _free_slots.extend(range(MAX_PARALLEL_SEARCHES))
+            old = _pool
+            _pool = ProcessPoolExecutor(
+                workers,
+                mp_context=mp,
+                initializer=_init_worker,
+                initargs=(_shared_alphas, _shared_searches),
+            )
+            _pool_workers = workers
+            _pool_users[_pool] = 0
+            if old is not None:
+                _retire_pool(old)
+        if not _free_slots:
+            return None, None, None
+        slot = _free_slots.pop()
+        search_id = next(_search_ids)
+        _shared_searches[slot] = search_id
+        _pool_users[_pool] += 1
+        return _pool, slot, search_id
+
+
+def _retire_pool(pool):
+    """Cierra ``pool`` si ya no lo usa nadie (llamar con _pool_lock)."""
+    if not _pool_users.get(pool):
+        _pool_users.pop(pool, None)
+        pool.shutdown(wait=False)
+
+
+def _release_slot(pool, slot):
+    with _pool_lock:
+        _shared_searches[slot] = 0
+        _free_slots.append(slot)
+        _pool_users[pool] -= 1
+        if pool is not _pool:
+            _retire_pool(pool)
+
+
+def _discard_pool(pool):
+    """El pool se ha roto: la próxima búsqueda paralela crea otro."""
+    global _pool
+    with _pool_lock:
+        if pool is _pool:
+            _pool = None
+
+
+def _search_root_parallel(pos, depth, ctx, first_move, workers, tt_size_mb):
+    """
+    Como _search_root (ventana completa) pero repartiendo las jugadas. Si el
+    pool falla (se ha roto un proceso...) la iteración se hace en serie.
+    ``workers`` se limita a settings.MAX_SEARCH_WORKERS.
+    """
+    workers = min(workers, settings.MAX_SEARCH_WORKERS)
+    if workers < 2:
+        return _search_root(pos, depth, ctx, first_move)
+    tt_move = first_move
+    if tt_move == NO_MOVE and ctx.tt is not None:
+        entry = ctx.tt.probe(pos.hash)
+        if entry is not None:
+            tt_move = entry[3]
+    moves = _ordered_moves(pos, logic.legal_moves(pos), tt_move, depth, 0, ctx)
+    if len(moves) < 2:
+        return _search_root(pos, depth, ctx, first_move)
+
+    pool, slot, search_id = _acquire_slot(workers)
+    if pool is None:
+        return _search_root(pos, depth, ctx, first_move)
+
+    futures = []
+    broken = False
+    try:
+        undo = logic.make_move(pos, moves[0])
+        best_score = -_negamax(pos, depth - 1, 1, -math.inf, math.inf, ctx)
+        logic.unmake_move(pos, undo)
+        best_sq = moves[0]
+        _shared_alphas[slot] = best_score
+
+        time_left = None
+        if ctx.deadline is not None:
+            time_left = ctx.deadline - time.perf_counter()
+        try:
+            for sq in moves[1:]:
+                futures.append(
+                    pool.submit(
+                        _search_root_move,
+                        pos.discs[1],
+                        pos.discs[2],
+                        pos.turn,
+                        sq,
+                        depth,
+                        slot,
+                        search_id,
+                        ctx.heuristic_type,
+                        ctx.use_sorting,
+                        ctx.use_pvs,
+                        tt_size_mb,
+                        time_left,
+                    )
+                )
+
+            # Se recorren en orden de búsqueda: en empate gana la primera
+            for sq, future in zip(moves[1:], futures, strict=True):
+                result = _wait_result(future, ctx)
+                if result is None:
+                    raise SearchTimeout()
+                score, alpha, counters = result
+                ctx.add_counters(counters)
+                if score >= alpha and score > best_score:
+                    best_score = score
+                    best_sq = sq
+        except (BrokenProcessPool, RuntimeError):
+            # Un proceso ha muerto o el pool está cerrado (RuntimeError al enviar)
+            broken = True
+    finally:
+        for future in futures:
+            future.cancel()
+        _release_slot(pool, slot)
+
+    if broken:
+        _discard_pool(pool)
+        return _search_root(pos, depth, ctx, first_move)
+    if ctx.tt is not None:
+        ctx.tt.store(pos.hash, depth, best_score, EXACT, best_sq)
+    return best_sq, best_score
+
+
+def _wait_result(future, ctx):
+    """future.result() pero atento a ``ctx.stop`` mientras espera."""
+    while True:
+        try:
+            return future.result(timeout=0.05)
+        except FutureTimeout:
+            if ctx.stop is not None and ctx.stop.is_set():
+                raise SearchTimeout() from None
+
+
+class _SlotStop:
     """
-    Motor recursivo de búsqueda.
+    Parada de una tarea del pool (hace de ``SearchContext.stop``): se activa
+    cuando el hueco deja de ser de su búsqueda.
     """
-    opponent_id = 3 - my_player_id
-    current_player = my_player_id if is_maximizing else opponent_id
+
+    __slots__ = ("slot", "search_id")
+
+    def __init__(self, slot, search_id):
+        self.slot = slot
+        self.search_id = search_id
+
+    def is_set(self):
+        return _worker_searches[self.slot] != self.search_id
+
+
+def _search_root_move(
+    black,
+    white,
+    turn,
+    sq,
+    depth,
+    slot,
+    search_id,
+    heuristic_type,
+    use_sorting,
+    use_pvs,
+    tt_size_mb,
+    time_left,
+):
+    """
+    Tarea de un proceso del pool: busca la jugada ``sq`` de la raíz.
+    Devuelve (puntuación, alpha usado, contadores) o None si se acabó el tiempo
+    o la búsqueda ya terminó.
+    """
+    stop = _SlotStop(slot, search_id)
+    if stop.is_set():
+        return None
+    pos = logic.Position(black, white, turn)
+    logic.make_move(pos, sq)
+    tt = _shared_tt(heuristic_type)
+    if tt is None and tt_size_mb:
+        tt = _worker_state.table(heuristic_type, tt_size_mb)
+    evals = search_eval_cache(_worker_state)
+    ctx = SearchContext(heuristic_type, tt, use_sorting, use_pvs, evals)
+    ctx.stop = stop
+    if time_left is not None:
+        ctx.deadline = time.perf_counter() + time_left
+
+    alpha = _worker_alphas[slot]
+    try:
+        score = -_negamax(pos, depth - 1, 1, -math.inf, 1 - alpha, ctx)
+    except SearchTimeout:
+        return None
+
+    if score > alpha:
+        with _worker_alphas.get_lock():
+            if not stop.is_set() and score > _worker_alphas[slot]:
+                _worker_alphas[slot] = score
+    return score, alpha, ctx.counters()
+
+
+def _search_child(pos, depth, ply, alpha, beta, ctx, is_first):
+    """
+    Puntuación (desde el padre) del hijo ya jugado en ``pos``.
+    En modo PVS solo el primer hijo usa la ventana completa; el resto se
+    prueba con ventana nula y se vuelve a buscar si supera alpha.
+    """
+    if is_first or not ctx.use_pvs:
+        return -_negamax(pos, depth - 1, ply + 1, -beta, -alpha, ctx)
+    score = -_negamax(pos, depth - 1, ply + 1, -alpha - 1, -alpha, ctx)
+    if alpha < score < beta:
+        score = -_negamax(pos, depth - 1, ply + 1, -beta, -alpha, ctx)
+    return score
+
+
+def _ordered_moves(pos, moves, tt_move, depth, ply, ctx):
+    """
+    Jugadas en orden de búsqueda: primero la de la tabla de transposición y,
+    si ``use_sorting`` está activo, el resto de mejor a peor según historia +
+    mapa de calor (esquinas primero) y, en nodos profundos, la movilidad del
+    rival. Las killer de este ply desempatan.
+    """
+    squares = list(bitboard.iter_squares(moves))
+    if ctx.use_sorting and len(squares) > 1:
+        # Clave = (mapa de calor + historia [- movilidad rival]) * 4 + desempate
+        # killer. En Reversi una killer rara vez sirve en la posición hermana
+        # (el tablero cambia demasiado), así que solo desempata.
+        history = ctx.history
+        keys = {}
+        for sq in squares:
+            keys[sq] = (SQUARE_WEIGHTS[sq] + history[sq]) << 2
+        killer_1, killer_2 = ctx.killers[ply]
+        if killer_1 in keys:
+            keys[killer_1] += 2
+        if killer_2 in keys:
+            keys[killer_2] += 1
+        if depth >= MOBILITY_ORDERING_DEPTH:
+            for sq in squares:
+                undo = logic.make_move(pos, sq)
+                keys[sq] -= 40 * logic.legal_moves(pos).bit_count()
+                logic.unmake_move(pos, undo)
+        squares.sort(key=keys.__getitem__, reverse=True)
+    if tt_move != NO_MOVE and (moves >> tt_move) & 1:
+        squares.remove(tt_move)
+        squares.insert(0, tt_move)
+    return squares
+
+
+def _negamax(pos, depth, ply, alpha, beta, ctx):
+    """
+    Motor recursivo de búsqueda (negamax con poda alpha-beta).
+    La puntuación es siempre desde el punto de vista de ``pos.turn``.
+    """
+    ctx.nodes += 1
+    if not ctx.nodes % TIME_CHECK_INTERVAL and ctx.out_of_time():
+        raise SearchTimeout()
+
+    tt = ctx.tt
+    alpha_orig = alpha
+    tt_move = NO_MOVE
+
+    # --- TABLA DE TRANSPOSICIÓN ---
+    if tt is not None and depth > 0:
+        entry = tt.probe(pos.hash)
+        if entry is not None:
+            ctx.tt_hits += 1
+            entry_depth, entry_score, bound, tt_move = entry
+            # Solo cortamos si la cota guardada basta para la ventana actual.
+            # Exigimos la misma profundidad (no mayor) para que el valor de
+            # cada nodo no dependa del orden de búsqueda: así la búsqueda
+            # paralela elige lo mismo que en serie. En Reversi casi no cuesta
+            # nada, porque la profundidad restante va ligada al nº de fichas.
+            if entry_depth == depth and (
+                bound == EXACT
+                or (bound == LOWER and entry_score >= beta)
+                or (bound == UPPER and entry_score <= alpha)
+            ):
+                return entry_score
 
     # Obtenemos movimientos para saber si el juego sigue o se estanca
-    valid_moves = logic.get_valid_moves(board, current_player)
+    valid_moves = logic.legal_moves(pos)
 
     # --- CASO BASE ---
     if depth <= 0 or not valid_moves:
         if not valid_moves:
             # Chequear si es FIN DE PARTIDA real (ninguno mueve)
-            if not logic.get_valid_moves(board, 3 - current_player):
-                return evaluate_end_game(board, my_player_id)
+            logic.pass_turn(pos)
+            if not logic.legal_moves(pos):
+                logic.pass_turn(pos)
+                return evaluate_end_position(pos, pos.turn)
 
             # Si es solo un PASE de turno, seguimos profundizando pero sin consumir profundidad
             # o restando 1 para evitar bucles.
-            return _minimax(
-                board,
-                depth - 1,
-                alpha,
-                beta,
-                not is_maximizing,
-                my_player_id,
-                heuristic_type,
-            )
+            score = -_negamax(pos, depth - 1, ply + 1, -beta, -alpha, ctx)
+            logic.pass_turn(pos)
+            return score
 
         # Si llegamos al límite de profundidad, usamos la heurística
-        return evaluate_board(board, my_player_id, heuristic_type)
+        ctx.leaf_evals += 1
+        if ctx.evals is not None:
+            return ctx.evals.evaluate(pos, pos.turn, ctx.heuristic_type)
+        return evaluate_position(pos, pos.turn, ctx.heuristic_type)
 
     # --- RECURSIÓN ---
-    if is_maximizing:
-        max_eval = -math.inf
-        for move in valid_moves:
-            sim_result = logic.apply_move(board, move[0], move[1], my_player_id)
-            eval_score = _minimax(
-                sim_result.board_state,
-                depth - 1,
-                alpha,
-                beta,
-                False,
-                my_player_id,
-                heuristic_type,
-            )
-            max_eval = max(max_eval, eval_score)
-            alpha = max(alpha, eval_score)
-            if beta <= alpha:
-                break
-        return max_eval
-    else:
-        min_eval = math.inf
-        for move in valid_moves:
-            sim_result = logic.apply_move(board, move[0], move[1], opponent_id)
-            eval_score = _minimax(
-                sim_result.board_state,
-                depth - 1,
-                alpha,
-                beta,
-                True,
-                my_player_id,
-                heuristic_type,
-            )
-            min_eval = min(min_eval, eval_score)
-            beta = min(beta, eval_score)
-            if beta <= alpha:
-                break
-        return min_eval
+    best_score = -math.inf
+    best_sq = NO_MOVE
+    moves = _ordered_moves(pos, valid_moves, tt_move, depth, ply, ctx)
+    for i, sq in enumerate(moves):
+        undo = logic.make_move(pos, sq)
+        score = _search_child(pos, depth, ply, alpha, beta, ctx, i == 0)
+        logic.unmake_move(pos, undo)
+        if score > best_score:
+            best_score = score
+            best_sq = sq
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    ctx.record_cutoff(sq, depth, ply)
+                    ctx.cutoffs += 1
+                    if i == 0:
+                        ctx.first_move_cutoffs += 1
+                    break
+
+    if tt is not None:
+        if best_score <= alpha_orig:
+            bound = UPPER
+        elif best_score >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        tt.store(pos.hash, depth, best_score, bound, best_sq)
+    return best_score
@@ -0,0 +1,112 @@
+import numpy as np
+
+from app import bitboard, logic
+from app.ai.heuristics import evaluate_position
+from app.logic import SQUARE_WEIGHTS
+
+# --- EVALUACIÓN EN LOTE ---
+# Las mismas heurísticas que heuristics.evaluate_position pero para muchas
+# posiciones a la vez con NumPy: cada bitboard es un elemento de un array
+# uint64 y get_moves hace los mismos desplazamientos sobre todo el array.
+# Sirve para puntuar cientos de posiciones de golpe (análisis de partidas
+# guardadas, hijos de un nodo...); para una sola posición es más rápido
+# evaluate_position.
+
+# Heurísticas vectorizadas (el resto se evalúa posición a posición)
+BATCH_HEURISTICS = ("static_weights", "mobility_based", "hybrid")
+
+_WEIGHTS = np.array(SQUARE_WEIGHTS, dtype=np.int64)
+_BITS = np.left_shift(np.uint64(1), np.arange(64, dtype=np.uint64))
+_FULL = np.uint64(bitboard.FULL)
+_SHIFTS = [(np.uint64(shift), np.uint64(mask)) for shift, mask in bitboard.SHIFTS]
+
+
+def to_bitboards(boards) -> np.ndarray:
+    """
+    Array (N, 2) uint64 de (negras, blancas) a partir de un array (N, 8, 8)
+    con 0 vacío, 1 negras y 2 blancas (como las matrices de la API), o del
+    propio array de pares de bitboards.
+    """
+    boards = np.asarray(boards)
+    if boards.ndim == 3 and boards.shape[1:] == (8, 8):
+        cells = boards.reshape(len(boards), 64)
+        black = np.where(cells == 1, _BITS, np.uint64(0)).sum(1, dtype=np.uint64)
+        white = np.where(cells == 2, _BITS, np.uint64(0)).sum(1, dtype=np.uint64)
+        return np.stack([black, white], axis=1)
+    if boards.ndim == 2 and boards.shape[1] == 2:
+        return boards.astype(np.uint64)
+    raise ValueError(f"Se esperaba (N, 8, 8) o (N, 2), no {boards.shape}")
+
+
+def _square_bits(x: np.ndarray) -> np.ndarray:
+    """Array (N, 64) con un 1 en cada casilla ocupada de ``x``."""
+    as_bytes = x.astype("<u8").view(np.uint8).reshape(len(x), 8)
+    return np.unpackbits(as_bytes, axis=1, bitorder="little")
+
+
+def popcount(x: np.ndarray) -> np.ndarray:
+    """Número de bits a 1 de cada elemento."""
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+        return np.bitwise_count(x).astype(np.int64)
+    return _square_bits(x).sum(1, dtype=np.int64)
+
+
+def get_moves(me: np.ndarray, opp: np.ndarray) -> np.ndarray:
+    """bitboard.get_moves sobre arrays uint64 (mismo relleno dumb7fill)."""
+    empty = ~(me | opp) & _FULL
+    moves = np.zeros_like(me)
+    for shift, mask in _SHIFTS:
+        w = opp & mask
+
+        t = w & (me << shift)
+        for _ in range(5):
+            t |= w & (t << shift)
+        moves |= t << shift
+
+        t = w & (me >> shift)
+        for _ in range(5):
+            t |= w & (t >> shift)
+        moves |= t >> shift
+
+    return moves & empty
+
+
+def eval_static_weights(me: np.ndarray, opp: np.ndarray) -> np.ndarray:
+    return (_square_bits(me).astype(np.int64) - _square_bits(opp)) @ _WEIGHTS
+
+
+def eval_mobility(me: np.ndarray, opp: np.ndarray) -> np.ndarray:
+    my_moves = popcount(get_moves(me, opp))
+    op_moves = popcount(get_moves(opp, me))
+    return 10 * (my_moves - op_moves)
+
+
+def evaluate_batch(boards, player_id, heuristic_type="static_weights") -> np.ndarray:
+    """
+    Puntuaciones (array int64 de N) de ``boards`` (ver to_bitboards) para
+    ``player_id``, que puede ser 1, 2 o un array con el jugador de cada una.
+    Dan lo mismo que evaluate_position posición a posición.
+    """
+    discs = to_bitboards(boards)
+    black, white = discs[:, 0], discs[:, 1]
+    player = np.broadcast_to(np.asarray(player_id), black.shape)
+    me = np.where(player == 1, black, white)
+    opp = np.where(player == 1, white, black)
+
+    if heuristic_type == "mobility_based":
+        return eval_mobility(me, opp)
+    elif heuristic_type == "hybrid":
+        return eval_static_weights(me, opp) + eval_mobility(me, opp)
+    elif heuristic_type == "static_weights":
+        return eval_static_weights(me, opp)
+
+    # Heurísticas sin versión vectorizada: una a una
+    return np.array(
+        [
+            evaluate_position(
+                logic.Position(int(b), int(w), int(p)), int(p), heuristic_type
+            )
+            for b, w, p in zip(black, white, player, strict=True)
+        ],
+        dtype=np.int64,
+    )
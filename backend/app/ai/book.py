@@ -0,0 +1,276 @@
+import logging
+import mmap
+import os
+import struct
+import threading
+
+from app import bitboard, logic
+from app.core.config import settings
+from app.utils import get_initial_board
+
+logger = logging.getLogger(__name__)
+
+# --- LIBRO DE APERTURAS ---
+# Tabla posición -> jugada para las primeras jugadas de la partida. Las
+# posiciones se guardan normalizadas por simetría (las 8 rotaciones/reflejos
+# del tablero son la misma posición) y desde el punto de vista de quien mueve,
+# así que negras y blancas comparten entradas.
+#
+# Formato del fichero: cabecera + registros de tamaño fijo ordenados por
+# (fichas de quien mueve, fichas del rival), para buscarlos con búsqueda
+# binaria directamente sobre el fichero mapeado en memoria.
+
+MAGIC = b"RVBK"
+VERSION = 2
+# magic, versión, nº de registros, jugada más avanzada del libro (ver
+# OpeningBook.max_plies; la versión 1 no la guardaba)
+HEADER = struct.Struct("<4sIII")
+HEADER_V1 = struct.Struct("<4sII")
+# fichas de quien mueve, fichas del rival, partidas vistas, jugada (0-63)
+RECORD = struct.Struct("<QQHBx")
+
+# Hasta qué jugada se minan las partidas guardadas
+MAX_BOOK_PLIES = 12
+
+
+# --- SIMETRÍAS ---
+# Casilla a la que va cada casilla con cada simetría (ver bitboard.transform),
+# y la inversa
+SYMMETRY_SQUARES = [
+    [bitboard.transform(1 << sq, t).bit_length() - 1 for sq in range(64)]
+    for t in range(8)
+]
+INVERSE_SQUARES = [[0] * 64 for _ in range(8)]
+for _t in range(8):
+    for _sq, _image in enumerate(SYMMETRY_SQUARES[_t]):
+        INVERSE_SQUARES[_t][_image] = _sq
+
+
+def _side_to_move(board, player):
+    black, white = bitboard.from_board(board)
+    return (black, white) if player == 1 else (white, black)
+
+
+def normalize(me: int, opp: int):
+    """Devuelve ((mis fichas, rivales) canónicas, simetría aplicada)."""
+    best = None
+    best_t = 0
+    for t in range(8):
+        key = (bitboard.transform(me, t), bitboard.transform(opp, t))
+        if best is None or key < best:
+            best = key
+            best_t = t
+    return best, best_t
+
+
+# --- LECTURA ---
+class OpeningBook:
+    """Libro abierto con mmap: las consultas no cargan el fichero en memoria."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header()
+        except ValueError:
+            self._mm.close()
+            raise ValueError(f"{path} no es un libro de aperturas válido") from None
+
+    def _read_header(self):
+        size = len(self._mm)
+        if size < HEADER_V1.size:
+            raise ValueError
+        magic, version, count = HEADER_V1.unpack_from(self._mm, 0)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError
+        self.count = count
+        if version == 1:
+            self._offset = HEADER_V1.size
+            self.max_plies = 60
+        elif size < HEADER.size:
+            raise ValueError
+        else:
+            self._offset = HEADER.size
+            self.max_plies = HEADER.unpack_from(self._mm, 0)[3]
+        # Fichero cortado: las búsquedas leerían fuera
+        if size < self._offset + count * RECORD.size:
+            raise ValueError
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self._mm.close()
+
+    def probe(self, me: int, opp: int):
+        """Búsqueda binaria de una posición canónica: (partidas, jugada) o None."""
+        lo, hi = 0, self.count
+        key = (me, opp)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            rec_me, rec_opp, games, move = RECORD.unpack_from(
+                self._mm, self._offset + mid * RECORD.size
+            )
+            rec = (rec_me, rec_opp)
+            if rec == key:
+                return games, move
+            if rec < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def lookup(self, board, player):
+        """Jugada del libro para ``player`` en ``board`` como (fila, col) o None."""
+        me, opp = _side_to_move(board, player)
+        # Pasada la última jugada del libro no hace falta ni normalizar
+        if (me | opp).bit_count() - 4 > self.max_plies:
+            return None
+        (canon_me, canon_opp), t = normalize(me, opp)
+        entry = self.probe(canon_me, canon_opp)
+        if entry is None:
+            return None
+        sq = INVERSE_SQUARES[t][entry[1]]
+        # Por si el fichero no corresponde a estas reglas: nunca jugar ilegal
+        if not bitboard.get_flips(me, opp, sq) or (me | opp) >> sq & 1:
+            return None
+        return bitboard.to_coords(sq)
+
+
+_book = None
+_book_version = None  # (ruta, fecha de modificación) del libro abierto
+_book_lock = threading.Lock()
+
+
+def get_book():
+    """
+    El libro configurado en settings.OPENING_BOOK_PATH (o None). Se vuelve a
+    abrir si el fichero cambia, así que un libro generado (o regenerado) con
+    el servidor en marcha se usa sin reiniciarlo. Si no se puede abrir (no
+    es un libro, está corrupto...) se avisa una vez y se juega sin libro
+    hasta que cambie.
+    """
+    global _book, _book_version
+    path = settings.OPENING_BOOK_PATH
+    if not path:
+        return None
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    with _book_lock:
+        if _book_version != (path, mtime):
+            # El libro anterior no se cierra: puede haber consultas en curso
+            # (el mmap se libera cuando nadie lo usa)
+            _book = None
+            if mtime is not None:
+                try:
+                    _book = OpeningBook(path)
+                except (OSError, ValueError) as e:
+                    logger.warning("No se pudo abrir el libro %s: %s", path, e)
+            _book_version = (path, mtime)
+        return _book
+
+
+def lookup(board, player):
+    book = get_book()
+    return None if book is None else book.lookup(board, player)
+
+
+# --- CONSTRUCCIÓN ---
+class BookBuilder:
+    """
+    Acumula estadísticas por posición canónica y jugada a partir de partidas
+    jugadas (add_game) o búsquedas profundas (add_search, que mandan).
+    """
+
+    def __init__(self, max_plies: int = MAX_BOOK_PLIES):
+        self.max_plies = max_plies
+        # (mis fichas, rivales) -> {jugada: [partidas, puntos]}
+        self.stats = {}
+        self.searched = {}  # (mis fichas, rivales) -> jugada
+
+    def add_game(self, moves, winner):
+        """
+        ``moves``: jugadas en orden como (fila, col) o None si fue pase.
+        ``winner``: "black", "white" o "draw".
+        """
+        pos = logic.Position.from_board(get_initial_board(), 1)
+        for ply, move in enumerate(moves):
+            if ply >= self.max_plies:
+                break
+            if move is None:
+                logic.pass_turn(pos)
+                continue
+            if not logic.legal_moves(pos):
+                logic.pass_turn(pos)  # Pase que no quedó guardado
+            player = pos.turn
+            sq = bitboard.square(move[0], move[1])
+            if not (logic.legal_moves(pos) >> sq) & 1:
+                return  # La partida no cuadra con las reglas: la dejamos
+            key, t = normalize(pos.discs[player], pos.discs[3 - player])
+            if winner == "draw":
+                points = 0.5
+            else:
+                points = 1.0 if winner == ("black" if player == 1 else "white") else 0
+            entry = self.stats.setdefault(key, {}).setdefault(
+                SYMMETRY_SQUARES[t][sq], [0, 0.0]
+            )
+            entry[0] += 1
+            entry[1] += points
+            logic.make_move(pos, sq)
+
+    def add_search(self, me: int, opp: int, sq: int):
+        key, t = normalize(me, opp)
+        self.searched[key] = SYMMETRY_SQUARES[t][sq]
+
+    def records(self, min_games: int = 1):
+        """Registros (me, opp, partidas, jugada) ordenados para write_book."""
+        records = {}
+        for key, moves in self.stats.items():
+            candidates = [item for item in moves.items() if item[1][0] >= min_games]
+            if not candidates:
+                continue
+            # Mejor resultado medio; en empate, la más jugada
+            move, _ = max(
+                candidates, key=lambda item: (item[1][1] / item[1][0], item[1][0])
+            )
+            games = sum(entry[0] for entry in moves.values())
+            records[key] = (min(games, 0xFFFF), move)
+        for key, move in self.searched.items():
+            games = records.get(key, (0, None))[0]
+            records[key] = (games, move)
+        return sorted(
+            (me, opp, games, move) for (me, opp), (games, move) in records.items()
+        )
+
+
+def write_book(path, records):
+    """Escribe el fichero (registros ya ordenados, ver BookBuilder.records)."""
+    tmp = f"{path}.tmp"
+    max_plies = max(((me | opp).bit_count() - 4 for me, opp, *_ in records), default=0)
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(records), max_plies))
+        for record in records:
+            f.write(RECORD.pack(*record))
+    os.replace(tmp, path)
+
+
+def reachable_positions(max_plies: int):
+    """Posiciones canónicas (me, opp) alcanzables en ``max_plies`` jugadas."""
+    level = {normalize(*_side_to_move(get_initial_board(), 1))[0]}
+    seen = set(level)
+    for _ in range(max_plies):
+        following = set()
+        for me, opp in level:
+            moves = bitboard.get_moves(me, opp)
+            if not moves:
+                continue
+            for sq in bitboard.iter_squares(moves):
+                flips = bitboard.get_flips(me, opp, sq)
+                key = normalize(opp ^ flips, me | flips | (1 << sq))[0]
+                if key not in seen:
+                    seen.add(key)
+                    following.add(key)
+        level = following
+    return seen
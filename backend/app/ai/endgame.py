@@ -0,0 +1,301 @@
+import time
+from typing import NamedTuple
+
+from app import bitboard
+from app.ai.stability import stable_discs
+from app.ai.transposition import NO_MOVE
+
+# Resolución exacta de finales: con pocas casillas libres se busca hasta el
+# final de la partida y la puntuación es la diferencia real de fichas (la
+# misma que score_black - score_white al acabar), no la heurística.
+# Trabaja directamente con el par (mis fichas, fichas rivales) sin hash.
+
+# Con más casillas libres que esto las jugadas se ordenan por "fastest-first"
+# (primero las que dejan menos respuestas al rival); por debajo basta la
+# paridad, porque generar las jugadas de cada hijo cuesta más que lo que ahorra
+FASTEST_FIRST_EMPTIES = 5
+
+# Posiciones con al menos estas casillas libres se guardan en la tabla
+TT_MIN_EMPTIES = 6
+
+# Con al menos estas casillas libres se prueba el corte por estabilidad: las
+# fichas estables del rival acotan lo que podemos sacar (con menos no compensa)
+STABILITY_MIN_EMPTIES = 7
+
+# Los nodos del final cuestan mucho más que los de alphabeta (ordenan los hijos
+# generando sus jugadas): se mira el reloj más a menudo
+TIME_CHECK_INTERVAL = 128
+
+# Cuadrantes 4x4 para la paridad: jugar en un cuadrante con un número impar de
+# casillas libres suele dejarnos la última jugada de esa zona
+QUADRANTS = (
+    0x000000000F0F0F0F,
+    0x00000000F0F0F0F0,
+    0x0F0F0F0F00000000,
+    0xF0F0F0F000000000,
+)
+
+# Casillas adyacentes: sin una ficha rival al lado no se puede voltear nada
+NEIGHBOURS = [bitboard.neighbours(1 << sq) for sq in range(64)]
+
+
+class EndgameResult(NamedTuple):
+    move: int  # Casilla (0-63) o NO_MOVE si hay que pasar / la partida acabó
+    margin: int  # Diferencia final de fichas desde el punto de vista de quien mueve
+    outcome: str  # "win", "loss" o "draw"
+
+
+class _Timeout(Exception):
+    pass
+
+
+def solve(
+    pos, deadline: float | None = None, stop=None, stats=None
+) -> EndgameResult | None:
+    """
+    Resuelve la posición hasta el final para ``pos.turn``.
+    ``deadline`` es un instante de time.perf_counter(); si se alcanza antes de
+    terminar (o se activa el threading.Event ``stop``) devuelve None y el
+    llamador debe recurrir a la búsqueda normal. Los nodos visitados se suman
+    a ``stats`` (SearchStats) aunque no termine.
+    """
+    solver = _Solver(deadline, stop)
+    me = pos.discs[pos.turn]
+    opp = pos.discs[3 - pos.turn]
+    try:
+        move, margin = solver.root(me, opp)
+    except _Timeout:
+        return None
+    finally:
+        if stats is not None:
+            stats.nodes += solver.nodes
+    if stats is not None:
+        stats.source = "endgame"
+        stats.depth_completed = pos.empties()
+    if margin > 0:
+        outcome = "win"
+    elif margin < 0:
+        outcome = "loss"
+    else:
+        outcome = "draw"
+    return EndgameResult(move, margin, outcome)
+
+
+def _parity_mask(empty: int) -> int:
+    """Casillas libres que están en cuadrantes con un número impar de huecos."""
+    odd = 0
+    for quadrant in QUADRANTS:
+        region = empty & quadrant
+        if region.bit_count() & 1:
+            odd |= region
+    return odd
+
+
+def _final_margin(me: int, opp: int) -> int:
+    return me.bit_count() - opp.bit_count()
+
+
+class _Solver:
+    __slots__ = ("deadline", "stop", "nodes", "next_check", "tt")
+
+    def __init__(self, deadline=None, stop=None):
+        self.deadline = deadline
+        self.stop = stop
+        self.nodes = 0
+        # Los nodos de _search_small se cuentan aparte, así que el reloj se
+        # mira al pasar este umbral (no con nodes % intervalo, que los salta)
+        self.next_check = TIME_CHECK_INTERVAL
+        # (mis fichas, rivales) -> (cota inferior, cota superior, mejor jugada)
+        self.tt = {}
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes >= self.next_check:
+            self.next_check = self.nodes + TIME_CHECK_INTERVAL
+            if self.stop is not None and self.stop.is_set():
+                raise _Timeout()
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                raise _Timeout()
+
+    def root(self, me, opp):
+        """Devuelve (mejor casilla, margen exacto)."""
+        moves = bitboard.get_moves(me, opp)
+        if not moves:
+            if not bitboard.get_moves(opp, me):
+                return NO_MOVE, _final_margin(me, opp)
+            return NO_MOVE, -self.search(opp, me, -65, 65, True)
+
+        alpha, beta = -65, 65
+        best_sq = NO_MOVE
+        for i, (sq, flips, replies) in enumerate(self._ordered(me, opp, moves)):
+            new_me = me | flips | (1 << sq)
+            new_opp = opp ^ flips
+            if i == 0:
+                score = -self.search(new_opp, new_me, -beta, -alpha, False, replies)
+            else:
+                score = -self.search(
+                    new_opp, new_me, -alpha - 1, -alpha, False, replies
+                )
+                if score > alpha:
+                    score = -self.search(new_opp, new_me, -beta, -score, False, replies)
+            if score > alpha:
+                alpha = score
+                best_sq = sq
+        return best_sq, alpha
+
+    def _ordered(self, me, opp, moves, tt_move=NO_MOVE):
+        """
+        Lista de (casilla, volteadas, jugadas del rival o None) en orden de
+        búsqueda: primero la de la tabla, después fastest-first con la paridad
+        como desempate.
+        """
+        empty = ~(me | opp) & bitboard.FULL
+        odd = _parity_mask(empty)
+        children = []
+        if empty.bit_count() > FASTEST_FIRST_EMPTIES:
+            for sq in bitboard.iter_squares(moves):
+                flips = bitboard.get_flips(me, opp, sq)
+                new_me = me | flips | (1 << sq)
+                replies = bitboard.get_moves(opp ^ flips, new_me)
+                key = (replies.bit_count() << 1) | (not (odd >> sq) & 1)
+                if sq == tt_move:
+                    key = -1
+                children.append((key, sq, flips, replies))
+            children.sort()
+            return [child[1:] for child in children]
+
+        for sq in bitboard.iter_squares(moves & odd):
+            children.append((sq, bitboard.get_flips(me, opp, sq), None))
+        for sq in bitboard.iter_squares(moves & ~odd):
+            children.append((sq, bitboard.get_flips(me, opp, sq), None))
+        return children
+
+    def search(self, me, opp, alpha, beta, passed, moves=None):
+        """
+        Negamax con PVS hasta el final; margen para ``me``. ``moves`` son las
+        jugadas de ``me`` si ya se calcularon al ordenar en el padre.
+        """
+        self._tick()
+        empty = ~(me | opp) & bitboard.FULL
+        n_empty = empty.bit_count()
+        if n_empty <= 4:
+            if not empty:
+                return _final_margin(me, opp)
+            odd = _parity_mask(empty)
+            squares = list(bitboard.iter_squares(odd))
+            squares.extend(bitboard.iter_squares(empty ^ odd))
+            return self._search_small(me, opp, squares, alpha, beta, passed)
+
+        # Corte por estabilidad: como mucho acabamos con todo menos las fichas
+        # estables del rival. Solo se calculan si, con todas las del rival
+        # estables, ya no llegaríamos a alpha.
+        if n_empty >= STABILITY_MIN_EMPTIES and 64 - 2 * opp.bit_count() <= alpha:
+            upper = 64 - 2 * stable_discs(opp, me).bit_count()
+            if upper <= alpha:
+                return upper
+
+        if moves is None:
+            moves = bitboard.get_moves(me, opp)
+        if not moves:
+            if passed:
+                return _final_margin(me, opp)
+            return -self.search(opp, me, -beta, -alpha, True)
+
+        tt_move = NO_MOVE
+        key = None
+        if n_empty >= TT_MIN_EMPTIES:
+            key = (me, opp)
+            entry = self.tt.get(key)
+            if entry is not None:
+                lower, upper, tt_move = entry
+                if lower >= beta:
+                    return lower
+                if upper <= alpha:
+                    return upper
+                if lower == upper:
+                    return lower
+                alpha = max(alpha, lower)
+                beta = min(beta, upper)
+
+        alpha_orig = alpha
+        best = -65
+        best_sq = NO_MOVE
+        children = self._ordered(me, opp, moves, tt_move)
+        for i, (sq, flips, replies) in enumerate(children):
+            new_me = me | flips | (1 << sq)
+            new_opp = opp ^ flips
+            if i == 0:
+                score = -self.search(new_opp, new_me, -beta, -alpha, False, replies)
+            else:
+                score = -self.search(
+                    new_opp, new_me, -alpha - 1, -alpha, False, replies
+                )
+                if alpha < score < beta:
+                    score = -self.search(new_opp, new_me, -beta, -score, False, replies)
+            if score > best:
+                best = score
+                best_sq = sq
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if key is not None:
+            lower, upper, _ = self.tt.get(key, (-64, 64, NO_MOVE))
+            if best >= beta:
+                lower = best
+            elif best <= alpha_orig:
+                upper = best
+            else:
+                lower = upper = best
+            self.tt[key] = (lower, upper, best_sq)
+        return best
+
+    def _search_small(self, me, opp, squares, alpha, beta, passed):
+        """
+        Últimas 1-4 casillas: se prueban directamente las casillas libres
+        (``squares``, ya ordenadas por paridad) sin generar máscaras de jugadas.
+        """
+        if len(squares) == 1:
+            return self._last_square(me, opp, squares[0])
+
+        best = -65
+        for sq in squares:
+            if not NEIGHBOURS[sq] & opp:
+                continue
+            flips = bitboard.get_flips(me, opp, sq)
+            if not flips:
+                continue
+            self.nodes += 1
+            rest = [other for other in squares if other != sq]
+            score = -self._search_small(
+                opp ^ flips, me | flips | (1 << sq), rest, -beta, -alpha, False
+            )
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        return best
+
+        if best == -65:
+            # No hay jugada: pasa o se acaba la partida
+            if passed:
+                return _final_margin(me, opp)
+            return -self._search_small(opp, me, squares, -beta, -alpha, True)
+        return best
+
+    def _last_square(self, me, opp, sq):
+        """Una sola casilla libre: la juega quien pueda, o nadie."""
+        self.nodes += 1
+        margin = _final_margin(me, opp)
+        if NEIGHBOURS[sq] & opp:
+            flips = bitboard.get_flips(me, opp, sq)
+            if flips:
+                # Ganamos las volteadas (cuentan doble) y la ficha colocada
+                return margin + 2 * flips.bit_count() + 1
+        if NEIGHBOURS[sq] & me:
+            flips = bitboard.get_flips(opp, me, sq)
+            if flips:
+                return margin - 2 * flips.bit_count() - 1
+        return margin
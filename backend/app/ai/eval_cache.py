@@ -0,0 +1,91 @@
+import random
+from array import array
+from functools import cache
+
+from app.ai.heuristics import evaluate_position
+from app.ai.transposition import ENTRY_BYTES, _entry_count
+from app.core.config import settings
+
+# Caché de evaluaciones: alphabeta evalúa muchas veces la misma hoja (las
+# transposiciones no se miran en la tabla a profundidad 0) y las simulaciones
+# guiadas de montecarlo repiten las mismas posiciones cerca de la raíz.
+#
+# Array de tamaño fijo con direccionamiento directo por el hash Zobrist de la
+# posición mezclado con la heurística y el jugador; una colisión pisa la
+# entrada anterior. Cada entrada son dos enteros de 64 bits (clave y valor),
+# como en la tabla de transposición (mismo ENTRY_BYTES).
+
+# Mezcla para evaluar desde el punto de vista de las blancas (el hash ya
+# distingue a quién le toca, pero no para quién se evalúa)
+_PLAYER_2_KEY = random.Random("eval_cache_player").getrandbits(64)
+
+
+@cache
+def _heuristic_key(heuristic_type) -> int:
+    heuristic = getattr(heuristic_type, "value", heuristic_type)
+    return random.Random(f"eval_cache_{heuristic}").getrandbits(64)
+
+
+class EvalCache:
+    """
+    Evaluaciones ya calculadas, por (posición, heurística, jugador).
+    ``hits`` y ``misses`` cuentan los aciertos y fallos desde new_search().
+    """
+
+    __slots__ = ("size_mb", "mask", "keys", "values", "hits", "misses")
+
+    def __init__(self, size_mb: int = 4):
+        self.size_mb = size_mb
+        n = _entry_count(size_mb * 1024 * 1024)
+        self.mask = n - 1
+        self.keys = array("Q", bytes(8 * n))
+        self.values = array("q", bytes(8 * n))
+        self.hits = 0
+        self.misses = 0
+
+    def nbytes(self) -> int:
+        return (self.mask + 1) * ENTRY_BYTES
+
+    def new_search(self):
+        """Empieza a contar de cero (las entradas siguen valiendo)."""
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        n = self.mask + 1
+        self.keys = array("Q", bytes(8 * n))
+        self.values = array("q", bytes(8 * n))
+        self.new_search()
+
+    def evaluate(self, pos, player_id, heuristic_type="static_weights"):
+        """Como heuristics.evaluate_position, pero mirando antes la caché."""
+        key = pos.hash ^ _heuristic_key(heuristic_type)
+        if player_id == 2:
+            key ^= _PLAYER_2_KEY
+        i = key & self.mask
+        if self.keys[i] == key:
+            self.hits += 1
+            return self.values[i]
+        self.misses += 1
+        score = evaluate_position(pos, player_id, heuristic_type)
+        self.keys[i] = key
+        self.values[i] = score
+        return score
+
+
+def search_eval_cache(state):
+    """
+    Caché de evaluaciones para una búsqueda: la guardada en ``state`` (el
+    SearchState de alphabeta o montecarlo, en su atributo ``evals``) si lo
+    hay, para que las búsquedas de la misma partida la compartan, o una vacía.
+    None si está desactivada (settings.EVAL_CACHE_MB = 0).
+    """
+    size_mb = settings.EVAL_CACHE_MB
+    if not size_mb:
+        return None
+    if state is None:
+        return EvalCache(size_mb)
+    if state.evals is None or state.evals.size_mb != size_mb:
+        state.evals = EvalCache(size_mb)
+    state.evals.new_search()
+    return state.evals
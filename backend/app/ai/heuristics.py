@@ -1,69 +1,114 @@
-from app import logic
-
-# --- MAPA DE CALOR ESTÁTICO ---
-# Esquinas (100) valiosas, casillas X (-20/-50) peligrosas.
-POSITION_WEIGHTS = [
-    [100, -20, 10, 5, 5, 10, -20, 100],
-    [-20, -50, -2, -2, -2, -2, -50, -20],
-    [10, -2, 5, 1, 1, 5, -2, 10],
-    [5, -2, 1, 2, 2, 1, -2, 5],
-    [5, -2, 1, 2, 2, 1, -2, 5],
-    [10, -2, 5, 1, 1, 5, -2, 10],
-    [-20, -50, -2, -2, -2, -2, -50, -20],
-    [100, -20, 10, 5, 5, 10, -20, 100],
-]
-
-
-def eval_static_weights(board, player_id):
-    """Suma los valores de las casillas ocupadas según el mapa de calor."""
-    opponent_id = 3 - player_id
-    score = 0
-    for r in range(8):
-        for c in range(8):
-            cell = board[r][c]
-            if cell == player_id:
-                score += POSITION_WEIGHTS[r][c]
-            elif cell == opponent_id:
-                score -= POSITION_WEIGHTS[r][c]
-    return score
-
-
-def eval_mobility(board, player_id):
+from app import bitboard, logic
+from app.ai.patterns import PatternTables
+from app.ai.stability import stable_discs
+
+# El mapa de calor vive en logic: Position lleva su suma al día en cada jugada
+from app.logic import SQUARE_WEIGHTS
+
+# Tablas de la evaluación por patrones (ver patterns), generadas con este mapa
+PATTERN_TABLES = PatternTables(SQUARE_WEIGHTS)
+
+# Las funciones eval_* trabajan sobre una logic.Position para que los motores
+# evalúen las hojas sin reconstruir la matriz 8x8.
+
+
+def eval_static_weights(pos, player_id):
+    """Valor de las casillas ocupadas según el mapa de calor (mías - rivales)."""
+    return pos.positional[player_id] - pos.positional[3 - player_id]
+
+
+def eval_mobility(pos, player_id):
     """Premia tener más movimientos disponibles que el rival."""
-    opponent_id = 3 - player_id
-    my_moves = len(logic.get_valid_moves(board, player_id))
-    op_moves = len(logic.get_valid_moves(board, opponent_id))
+    me = pos.discs[player_id]
+    opp = pos.discs[3 - player_id]
+    my_moves = bitboard.get_moves(me, opp).bit_count()
+    op_moves = bitboard.get_moves(opp, me).bit_count()
 
     # Evitar división por cero si usamos ratios, aquí usamos diferencia simple multiplicada
     return 10 * (my_moves - op_moves)
 
 
-def eval_hybrid(board, player_id):
+def eval_potential_mobility(pos, player_id):
+    """
+    Movilidad potencial (casillas libres junto a fichas rivales, por donde
+    podremos jugar más adelante) menos fichas de frontera (propias junto a una
+    casilla libre, las que el rival podrá voltear). Sin generar jugadas.
+    """
+    me = pos.discs[player_id]
+    opp = pos.discs[3 - player_id]
+    empty = ~(me | opp) & bitboard.FULL
+    near_empty = bitboard.neighbours(empty)
+    potential = (empty & bitboard.neighbours(opp)).bit_count() - (
+        empty & bitboard.neighbours(me)
+    ).bit_count()
+    frontier = (me & near_empty).bit_count() - (opp & near_empty).bit_count()
+    return 5 * (potential - frontier)
+
+
+def eval_stability(pos, player_id):
+    """Fichas estables (ya no se pueden perder): mías - rivales."""
+    me = pos.discs[player_id]
+    opp = pos.discs[3 - player_id]
+    return 10 * (stable_discs(me, opp).bit_count() - stable_discs(opp, me).bit_count())
+
+
+def eval_hybrid_frontier(pos, player_id):
+    """Híbrida más movilidad potencial, frontera y fichas estables."""
+    return (
+        eval_hybrid(pos, player_id)
+        + eval_potential_mobility(pos, player_id)
+        + eval_stability(pos, player_id)
+    )
+
+
+def eval_hybrid(pos, player_id):
     """Combina posición (estrategia) y movilidad (táctica)."""
     # 70% peso a posición, 30% a movilidad (ajustable)
-    pos_score = eval_static_weights(board, player_id)
-    mob_score = eval_mobility(board, player_id)
+    pos_score = eval_static_weights(pos, player_id)
+    mob_score = eval_mobility(pos, player_id)
     return pos_score + mob_score
 
 
-def evaluate_board(board, player_id, heuristic_type="static_weights"):
+def eval_pattern(pos, player_id):
+    """Bordes, esquinas y diagonales buscados en tablas por fase de partida."""
+    return PATTERN_TABLES.evaluate(pos.discs[player_id], pos.discs[3 - player_id])
+
+
+def evaluate_position(pos, player_id, heuristic_type="static_weights"):
     """
     Dispatcher principal: llama a la función correcta según el nombre.
     """
     if heuristic_type == "mobility_based":
-        return eval_mobility(board, player_id)
+        return eval_mobility(pos, player_id)
     elif heuristic_type == "hybrid":
-        return eval_hybrid(board, player_id)
+        return eval_hybrid(pos, player_id)
+    elif heuristic_type == "pattern":
+        return eval_pattern(pos, player_id)
+    elif heuristic_type == "potential_mobility":
+        return eval_potential_mobility(pos, player_id)
+    elif heuristic_type == "hybrid_frontier":
+        return eval_hybrid_frontier(pos, player_id)
     # Default y "static_weights"
-    return eval_static_weights(board, player_id)
+    return eval_static_weights(pos, player_id)
 
 
-def evaluate_end_game(board, player_id):
+def evaluate_board(board, player_id, heuristic_type="static_weights"):
+    """Igual que evaluate_position pero recibiendo la matriz 8x8."""
+    return evaluate_position(
+        logic.Position.from_board(board, player_id), player_id, heuristic_type
+    )
+
+
+def evaluate_end_position(pos, player_id):
     """Evaluación definitiva para fin de partida (cuenta fichas reales)."""
-    my_count = sum(row.count(player_id) for row in board)
-    op_count = sum(row.count(3 - player_id) for row in board)
-    if my_count > op_count:
-        return 10000 + (my_count - op_count)
-    elif my_count < op_count:
-        return -10000 - (op_count - my_count)
+    diff = pos.disc_difference(player_id)
+    if diff > 0:
+        return 10000 + diff
+    elif diff < 0:
+        return -10000 + diff
     return 0
+
+
+def evaluate_end_game(board, player_id):
+    """Igual que evaluate_end_position pero recibiendo la matriz 8x8."""
+    return evaluate_end_position(logic.Position.from_board(board, player_id), player_id)
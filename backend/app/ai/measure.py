@@ -0,0 +1,120 @@
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, NamedTuple
+
+from app.models import MeasureLevel
+
+# --- MEDICIÓN DE LAS JUGADAS DEL BOT ---
+# tracemalloc es global al proceso: mientras mide una jugada cuenta también lo
+# que reserven las demás búsquedas en marcha (otras peticiones, pondering). Por
+# eso una medición de memoria espera a que no haya ninguna otra búsqueda y no
+# deja empezar otra hasta que acaba (ver SearchLock). Aun así el pico no es
+# exacto: incluye lo que reserven hilos del servidor que no buscan, y no cuenta
+# los procesos del pool de alphabeta.
+
+
+class SearchLock:
+    """
+    Cerrojo de lectores/escritor: muchas búsquedas a la vez (shared) o una
+    sola medición de memoria (exclusive). Las mediciones que esperan tienen
+    preferencia, para que un goteo de búsquedas no las deje sin turno.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._searches = 0
+        self._measuring = False
+        self._waiting = 0  # Mediciones esperando
+
+    @contextmanager
+    def shared(self):
+        with self._cond:
+            while self._measuring or self._waiting:
+                self._cond.wait()
+            self._searches += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._searches -= 1
+                if not self._searches:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self._cond:
+            self._waiting += 1
+            try:
+                while self._measuring or self._searches:
+                    self._cond.wait()
+            finally:
+                self._waiting -= 1
+            self._measuring = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._measuring = False
+                self._cond.notify_all()
+
+
+# Todas las búsquedas del proceso (select_best_move y pondering)
+search_lock = SearchLock()
+
+
+class Measurement(NamedTuple):
+    execution_time: float | None = None  # Segundos de reloj
+    # Segundos de CPU de este hilo (sin los procesos del pool de alphabeta)
+    cpu_time: float | None = None
+    memory_mb: float | None = None  # Pico de memoria reservada
+
+    def summary(self) -> str:
+        parts = []
+        if self.execution_time is not None:
+            parts.append(f"{self.execution_time:.3f}s")
+        if self.cpu_time is not None:
+            parts.append(f"{self.cpu_time:.3f}s CPU")
+        if self.memory_mb is not None:
+            parts.append(f"{self.memory_mb:.2f}MB")
+        return ", ".join(parts)
+
+
+def measure_performance(func):
+    """
+    Devuelve (resultado, Measurement). El nivel se elige en cada llamada con
+    ``measure`` (MeasureLevel, por defecto solo tiempos): tracemalloc hace
+    varias veces más lentas las búsquedas, así que la memoria solo se mide si
+    se pide, y entonces la llamada va sola (ver search_lock).
+    """
+
+    @wraps(func)
+    def wrapper(
+        *args, measure: MeasureLevel = MeasureLevel.TIME, **kwargs
+    ) -> tuple[Any, Measurement]:
+        if measure == MeasureLevel.MEMORY:
+            with search_lock.exclusive():
+                tracemalloc.start()
+                try:
+                    result, measurement = _timed(func, args, kwargs)
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+            return result, measurement._replace(memory_mb=peak / 1024 / 1024)
+        with search_lock.shared():
+            if measure == MeasureLevel.OFF:
+                return func(*args, **kwargs), Measurement()
+            return _timed(func, args, kwargs)
+
+    return wrapper
+
+
+def _timed(func, args, kwargs):
+    start_time = time.perf_counter()
+    start_cpu = time.thread_time()
+    result = func(*args, **kwargs)
+    cpu_time = time.thread_time() - start_cpu
+    execution_time = time.perf_counter() - start_time
+    return result, Measurement(execution_time, cpu_time)
@@ -3,18 +3,72 @@ import random
 import time
 from typing import Optional
 
-from app import logic
-from app.ai.heuristics import evaluate_board
+from app import bitboard, logic
+from app.ai.eval_cache import search_eval_cache
+from app.ai.heuristics import evaluate_position
+from app.ai.stats import SearchStats
 from app.models import Turn
 
+# Memoria aproximada de un Node (objeto, su Position y listas) para la caché de
+# estado por partida
+NODE_BYTES = 700
+
+# Hasta cuántas jugadas por debajo de la raíz anterior se busca la posición
+# actual al reutilizar el árbol (la del bot y la respuesta del rival)
+REUSE_DEPTH = 2
+
+
+class SearchState:
+    """
+    Lo que una búsqueda deja a la siguiente de la misma partida: el árbol
+    completo. La siguiente jugada parte del subárbol de la posición real.
+    También la caché de evaluaciones de las simulaciones guiadas.
+    """
+
+    __slots__ = ("root", "size", "evals")
+
+    def __init__(self):
+        self.root = None
+        self.size = 0  # Nodos del árbol guardado
+        self.evals = None
+
+    def nbytes(self):
+        size = self.size * NODE_BYTES
+        if self.evals is not None:
+            size += self.evals.nbytes()
+        return size
+
+    def subtree(self, pos):
+        """Nodo del árbol guardado con la misma posición que ``pos`` o None."""
+        if self.root is None:
+            return None
+        level = [self.root]
+        for _ in range(REUSE_DEPTH + 1):
+            for node in level:
+                if node.pos.discs == pos.discs and node.pos.turn == pos.turn:
+                    return node
+            level = [child for node in level for child in node.children]
+        return None
+
+
+def _count_nodes(root):
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(node.children)
+    return count
+
 
 class Node:
     """
     Nodo del árbol de búsqueda Monte Carlo.
     """
 
-    def __init__(self, board, parent=None, move=None, player_who_moved=None):
-        self.board = board
+    def __init__(self, pos, parent=None, move=None, player_who_moved=None):
+        # Cada nodo guarda su propia logic.Position (solo dos enteros y el turno)
+        self.pos = pos
         self.parent = parent
         self.move = move  # La jugada que llevó a este estado
         self.player_who_moved = player_who_moved  # Quién hizo la jugada (1 o 2)
@@ -32,13 +86,12 @@ class Node:
         # Determinamos de quién es el turno basándonos en quien movió antes.
         # Si nadie movió (raíz), asumimos que logic manejará el turno correcto externamente,
         # pero para nodos hijos:
-        if self.player_who_moved:
-            next_player = 3 - self.player_who_moved
-        else:
+        if not self.player_who_moved:
             # Caso raíz, se seteará externamente o se asume lógica del juego
             return
 
-        self.untried_moves = logic.get_valid_moves(self.board, next_player)
+        # self.pos ya tiene el turno del siguiente jugador (3 - player_who_moved)
+        self.untried_moves = list(bitboard.iter_squares(logic.legal_moves(self.pos)))
 
         # Si el jugador actual no tiene movimientos (PASS),
         # pero el juego no ha terminado, añadimos un movimiento "None" (Pass)
@@ -68,7 +121,20 @@ class Node:
         return self.children[choices_weights.index(max(choices_weights))]
 
 
-def get_move(board, player, parameters):
+def get_move(
+    board,
+    player,
+    parameters,
+    state: SearchState | None = None,
+    stop=None,
+    stats: SearchStats | None = None,
+):
+    """
+    Punto de entrada de Monte Carlo. Si se pasa ``state`` (ver SearchState)
+    se reutiliza el árbol de la jugada anterior y se deja el nuevo en él.
+    ``stop`` (threading.Event) termina las iteraciones antes de tiempo.
+    ``stats`` recibe las iteraciones hechas y el tamaño final del árbol.
+    """
     iterations = parameters.get("iterations", 1000)
     c_param = parameters.get("exploration_constant", 1.41)
     time_limit = parameters.get("time_limit", 4.5)
@@ -82,14 +148,24 @@ def get_move(board, player, parameters):
     # Si es cualquier otra (static, mobility...), usamos simulación guiada.
     use_random = heuristic_type == "none" or heuristic_type == "random_rollout"
 
-    root = Node(board, player_who_moved=3 - player)
-    root.untried_moves = logic.get_valid_moves(board, player)
+    # Las simulaciones guiadas repiten muchas posiciones: caché de evaluaciones
+    evals = None if use_random else search_eval_cache(state)
+
+    pos = logic.Position.from_board(board, player)
+    root = state.subtree(pos) if state is not None else None
+    if root is None:
+        root = Node(pos, player_who_moved=3 - player)
+    root.parent = None
 
     start_time = time.time()
+    done = 0
 
     for _ in range(iterations):
         if time.time() - start_time > time_limit:
             break
+        if stop is not None and stop.is_set():
+            break
+        done += 1
 
         # 1. Selection
         node = root
@@ -99,13 +175,16 @@ def get_move(board, player, parameters):
         # 2. Expansion
         current_turn_in_node = 3 - node.player_who_moved
         if node.untried_moves is None:
-            node.untried_moves = logic.get_valid_moves(node.board, current_turn_in_node)
+            node.untried_moves = list(
+                bitboard.iter_squares(logic.legal_moves(node.pos))
+            )
 
         if node.untried_moves:
             move = node.untried_moves.pop()
-            res = logic.apply_move(node.board, move[0], move[1], current_turn_in_node)
+            child_pos = node.pos.copy()
+            logic.make_move(child_pos, move)
             child_node = Node(
-                res.board_state,
+                child_pos,
                 parent=node,
                 move=move,
                 player_who_moved=current_turn_in_node,
@@ -115,9 +194,7 @@ def get_move(board, player, parameters):
 
         # 3. Simulation
         # Pasamos el flag derivado 'use_random'
-        winner = _simulate(
-            node.board, node.player_who_moved, use_random, heuristic_type
-        )
+        winner = _simulate(node.pos, use_random, heuristic_type, evals)
 
         # 4. Backpropagation
         while node:
@@ -128,24 +205,41 @@ def get_move(board, player, parameters):
                 node.wins += 0.5
             node = node.parent
 
+    if state is not None or stats is not None:
+        size = _count_nodes(root)
+        if state is not None:
+            state.root = root
+            state.size = size
+        if stats is not None:
+            stats.iterations = done
+            stats.tree_size = size
+            stats.search_time = time.time() - start_time
+    if stats is not None and evals is not None:
+        stats.eval_cache_hits += evals.hits
+        stats.eval_cache_misses += evals.misses
+
     if not root.children:
         return random.choice(logic.get_valid_moves(board, player) or [])
 
-    return max(root.children, key=lambda c: c.visits).move
+    return bitboard.to_coords(max(root.children, key=lambda c: c.visits).move)
 
 
-def _simulate(board, last_player_who_moved, use_random, heuristic_type):
-    current_board = [r[:] for r in board]
-    current_turn = 3 - last_player_who_moved
+def _simulate(pos, use_random, heuristic_type, evals=None):
+    # La partida simulada se juega en sitio sobre una copia de la posición
+    # (su turno ya es el del jugador que no hizo la última jugada)
+    current = pos.copy()
 
     while True:
-        valid_moves = logic.get_valid_moves(current_board, current_turn)
+        moves_mask = logic.legal_moves(current)
 
-        if not valid_moves:
-            if not logic.get_valid_moves(current_board, 3 - current_turn):
+        if not moves_mask:
+            # PASS: reutilizamos directamente las jugadas del rival
+            moves_mask = logic.resolve_pass(current)
+            if not moves_mask:
                 break
-            current_turn = 3 - current_turn
-            continue
+
+        current_turn = current.turn
+        valid_moves = list(bitboard.iter_squares(moves_mask))
 
         move_to_make = None
 
@@ -158,11 +252,13 @@ def _simulate(board, last_player_who_moved, use_random, heuristic_type):
             best_moves = []
 
             for m in valid_moves:
-                temp_res = logic.apply_move(current_board, m[0], m[1], current_turn)
-                # Reutilizamos la lógica común
-                score = evaluate_board(
-                    temp_res.board_state, current_turn, heuristic_type
-                )
+                undo = logic.make_move(current, m)
+                # Reutilizamos la lógica común (con caché si la hay)
+                if evals is not None:
+                    score = evals.evaluate(current, current_turn, heuristic_type)
+                else:
+                    score = evaluate_position(current, current_turn, heuristic_type)
+                logic.unmake_move(current, undo)
 
                 if score > best_score:
                     best_score = score
@@ -172,15 +268,9 @@ def _simulate(board, last_player_who_moved, use_random, heuristic_type):
 
             move_to_make = random.choice(best_moves)
 
-        res = logic.apply_move(
-            current_board, move_to_make[0], move_to_make[1], current_turn
-        )
-        current_board = res.board_state
-        if res.current_turn:
-            current_turn = res.current_turn
+        logic.make_move(current, move_to_make)
 
-    b = sum(r.count(1) for r in current_board)
-    w = sum(r.count(2) for r in current_board)
+    b, w = current.counts[1], current.counts[2]
     if b > w:
         return 1
     if w > b:
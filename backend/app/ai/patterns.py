@@ -0,0 +1,209 @@
+import numpy as np
+
+from app import bitboard
+
+# --- EVALUACIÓN POR PATRONES ---
+# En vez de sumar casilla a casilla, el tablero se corta en patrones (bordes,
+# esquinas 3x3 y 2x5, diagonales) y cada patrón se codifica como un índice en
+# base 3 (0 = vacía, 1 = mía, 2 = del rival) que se busca en una tabla
+# precalculada, una por fase de la partida. Así el valor de una casilla puede
+# depender de sus vecinas: una casilla X solo es mala si su esquina está libre,
+# y las fichas pegadas a una esquina propia en el borde ya no se pierden.
+#
+# Las tablas se generan con NumPy a partir del mapa de calor y unas pocas
+# reglas (no hay partidas de entrenamiento); cualquier tabla del mismo tamaño
+# sirve, así que se pueden sustituir por unas ajustadas sin tocar el resto.
+
+PHASES = 4
+
+# Fase según el número de fichas en el tablero (4-64)
+PHASE_BY_DISCS = [min((n - 4) * PHASES // 60, PHASES - 1) for n in range(65)]
+
+# Valor de cada ficha de diferencia en cada fase: solo cuentan al final (antes
+# tener muchas fichas suele ser malo, y con el mapa de calor empeoraba el juego)
+DISC_VALUE = (0, 0, 0, 2)
+# Casillas X y C con su esquina ya ocupada (libre: el mapa de calor)
+TAKEN_CORNER_VALUE = (5, 5, 5, 5)
+# Cada ficha estable en un borde (pegada a una esquina o borde lleno)
+STABLE_VALUE = (10, 15, 20, 20)
+
+# Índice en base 3 de una fila a partir de (mis bits << 8) | bits rivales: la
+# columna c es el dígito 3^c. Los primeros dígitos salen con % (3^5 = 243 para
+# las 2x5, 3^3 = 27 para las 3x3). La versión al revés lee la fila de derecha a
+# izquierda, para las esquinas de la derecha.
+_TERNARY = [sum(3**i for i in range(8) if b >> i & 1) for b in range(256)]
+_REVERSE = [int(f"{b:08b}"[::-1], 2) for b in range(256)]
+ROW_INDEX = [_TERNARY[p >> 8] + 2 * _TERNARY[p & 0xFF] for p in range(1 << 16)]
+REVERSED_ROW_INDEX = [
+    _TERNARY[_REVERSE[p >> 8]] + 2 * _TERNARY[_REVERSE[p & 0xFF]]
+    for p in range(1 << 16)
+]
+
+# Casillas de cada patrón en la esquina superior izquierda; el orden es el de
+# los dígitos del índice (la casilla i es el dígito 3^i)
+EDGE = [bitboard.square(0, c) for c in range(8)]
+CORNER_3X3 = [bitboard.square(r, c) for r in range(3) for c in range(3)]
+CORNER_2X5 = [bitboard.square(r, c) for r in range(2) for c in range(5)]
+DIAGONAL = [bitboard.square(i, i) for i in range(8)]
+
+# Casillas X y C: su valor depende de la esquina, así que solo las puntúa un
+# patrón que la incluya (la X la esquina 3x3, las C el borde)
+X_SQUARES = {9, 14, 49, 54}
+C_SQUARES = {1, 6, 8, 15, 48, 55, 57, 62}
+
+DIAGONAL_MASK = 0x8040201008040201
+ANTI_DIAGONAL_MASK = 0x0102040810204080
+# Multiplicar por esto junta en el byte alto las casillas de columnas distintas
+GATHER = 0x0101010101010101
+
+
+def _images(squares):
+    """Todas las posiciones del patrón en el tablero (por simetría)."""
+    mask = sum(1 << sq for sq in squares)
+    return {bitboard.transform(mask, t) for t in range(8)}
+
+
+PATTERNS = {
+    "edge": EDGE,
+    "corner_3x3": CORNER_3X3,
+    "corner_2x5": CORNER_2X5,
+    "diagonal": DIAGONAL,
+}
+
+
+def _coverage():
+    """Cuántos patrones del tablero incluyen cada casilla."""
+    coverage = np.zeros(64)
+    for squares in PATTERNS.values():
+        for image in _images(squares):
+            for sq in bitboard.iter_squares(image):
+                coverage[sq] += 1
+    return coverage
+
+
+def _digits(n):
+    """Matriz (3^n, n) con los dígitos en base 3 de cada índice."""
+    return (np.arange(3**n)[:, None] // 3 ** np.arange(n)) % 3
+
+
+def _stable_edge(digits):
+    """
+    Máscara (3^8, 8) de las fichas estables de un borde: las seguidas del
+    mismo color desde una esquina ocupada, o todas si el borde está lleno.
+    """
+    stable = np.zeros(digits.shape, dtype=bool)
+    stable |= (digits != 0).all(axis=1)[:, None]
+    for order in (range(8), range(7, -1, -1)):
+        order = list(order)
+        owner = digits[:, order[0]]
+        run = owner != 0
+        for j in order:
+            run &= digits[:, j] == owner
+            stable[:, j] |= run
+    return stable
+
+
+def build_table(name, square_weights, phase):
+    """Tabla de un patrón para una fase (valor desde el punto de vista de 1)."""
+    squares = PATTERNS[name]
+    coverage = _coverage()
+    digits = _digits(len(squares))
+    sign = (digits == 1).astype(np.int64) - (digits == 2)
+
+    # Mapa de calor repartido entre los patrones que comparten cada casilla
+    cell_weights = np.array(
+        [
+            0.0
+            if sq in X_SQUARES or sq in C_SQUARES
+            else square_weights[sq] / coverage[sq]
+            for sq in squares
+        ]
+    )
+    table = sign @ cell_weights
+
+    # Casillas X (esquina 3x3) y C (borde) según esté ocupada su esquina
+    if name == "corner_3x3":
+        context = [(4, 0)]  # (dígito de la casilla, dígito de su esquina)
+    elif name == "edge":
+        context = [(1, 0), (6, 7)]
+    else:
+        context = []
+    for digit, corner in context:
+        empty_value = square_weights[squares[digit]]
+        value = np.where(digits[:, corner] == 0, empty_value, TAKEN_CORNER_VALUE[phase])
+        table = table + sign[:, digit] * value
+
+    if name == "edge":
+        table = table + STABLE_VALUE[phase] * (sign * _stable_edge(digits)).sum(1)
+    return np.rint(table).astype(np.int32)
+
+
+class PatternTables:
+    """Tablas de todos los patrones: ``arrays[nombre]`` es (PHASES, 3^n)."""
+
+    def __init__(self, square_weights):
+        self.arrays = {
+            name: np.stack(
+                [build_table(name, square_weights, p) for p in range(PHASES)]
+            )
+            for name in PATTERNS
+        }
+        # Indexar un array de NumPy con enteros sueltos es lento: para evaluar
+        # posición a posición se usan copias en listas de Python
+        self._lists = [
+            tuple(self.arrays[name][p].tolist() for name in PATTERNS)
+            for p in range(PHASES)
+        ]
+
+    def evaluate(self, me: int, opp: int) -> int:
+        """Suma de patrones + fichas para el jugador con las fichas ``me``."""
+        diff = me.bit_count() - opp.bit_count()
+        phase = PHASE_BY_DISCS[me.bit_count() + opp.bit_count()]
+        edge, corner_3x3, corner_2x5, diagonal = self._lists[phase]
+        row = ROW_INDEX
+        rev = REVERSED_ROW_INDEX
+        score = DISC_VALUE[phase] * diff
+
+        # Dos pasadas: el tablero (filas 0, 1, 6, 7) y su traspuesto
+        # (columnas 0, 1, 6, 7). Los bordes y las 2x5 salen de las dos.
+        for m, o, corners in (
+            (me, opp, True),
+            (bitboard.transpose(me), bitboard.transpose(opp), False),
+        ):
+            p0 = ((m & 0xFF) << 8) | (o & 0xFF)
+            p1 = ((m >> 8) & 0xFF) << 8 | ((o >> 8) & 0xFF)
+            p6 = ((m >> 48) & 0xFF) << 8 | ((o >> 48) & 0xFF)
+            p7 = (m >> 56) << 8 | (o >> 56)
+            i0, i1, i6, i7 = row[p0], row[p1], row[p6], row[p7]
+            j0, j1, j6, j7 = rev[p0], rev[p1], rev[p6], rev[p7]
+            score += edge[i0] + edge[i7]
+
+            # 2x5: primera fila los dígitos 0-4 y la segunda los 5-9
+            score += (
+                corner_2x5[i0 % 243 + 243 * (i1 % 243)]
+                + corner_2x5[j0 % 243 + 243 * (j1 % 243)]
+                + corner_2x5[i7 % 243 + 243 * (i6 % 243)]
+                + corner_2x5[j7 % 243 + 243 * (j6 % 243)]
+            )
+
+            if corners:
+                # 3x3: filas 0, 1, 2 (o 7, 6, 5) con dígitos 0-2, 3-5 y 6-8
+                p2 = ((m >> 16) & 0xFF) << 8 | ((o >> 16) & 0xFF)
+                p5 = ((m >> 40) & 0xFF) << 8 | ((o >> 40) & 0xFF)
+                i2, i5, j2, j5 = row[p2], row[p5], rev[p2], rev[p5]
+                score += (
+                    corner_3x3[i0 % 27 + 27 * (i1 % 27) + 729 * (i2 % 27)]
+                    + corner_3x3[j0 % 27 + 27 * (j1 % 27) + 729 * (j2 % 27)]
+                    + corner_3x3[i7 % 27 + 27 * (i6 % 27) + 729 * (i5 % 27)]
+                    + corner_3x3[j7 % 27 + 27 * (j6 % 27) + 729 * (j5 % 27)]
+                )
+
+        # Diagonales: sus casillas están en columnas distintas y una
+        # multiplicación las junta en un byte (la casilla de la columna c en el
+        # bit c; para la diagonal principal, dígito i = casilla (i, i))
+        dm = ((me & DIAGONAL_MASK) * GATHER >> 56) & 0xFF
+        do = ((opp & DIAGONAL_MASK) * GATHER >> 56) & 0xFF
+        am = ((me & ANTI_DIAGONAL_MASK) * GATHER >> 56) & 0xFF
+        ao = ((opp & ANTI_DIAGONAL_MASK) * GATHER >> 56) & 0xFF
+        score += diagonal[row[dm << 8 | do]] + diagonal[row[am << 8 | ao]]
+        return score
@@ -0,0 +1,151 @@
+import threading
+from collections import OrderedDict
+
+from app import bitboard, logic
+from app.ai import book
+from app.ai.heuristics import evaluate_position
+from app.ai.measure import search_lock
+from app.ai.stats import SearchStats
+
+# Pondering: mientras el humano piensa, el bot calcula en segundo plano su
+# respuesta a cada jugada posible del humano (primero las más probables) y la
+# guarda por posición. Cuando llega la jugada real, la respuesta sale de la
+# caché o de la búsqueda que ya estaba en marcha para esa posición.
+
+# Respuestas precalculadas que se conservan (entre todas las partidas)
+PONDER_CACHE_SIZE = 4096
+
+# (negras, blancas, turno, parámetros) -> (jugada, SearchStats de su búsqueda)
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_jobs = {}  # id de partida -> _PonderJob en marcha
+_jobs_lock = threading.Lock()
+
+
+def _key(board, player, parameters):
+    black, white = bitboard.from_board(board)
+    params = repr(sorted((k, str(v)) for k, v in parameters.items()))
+    return black, white, player, params
+
+
+def _remember(key, move, stats):
+    with _cache_lock:
+        _cache[key] = (move, stats)
+        _cache.move_to_end(key)
+        while len(_cache) > PONDER_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+class _PonderJob:
+    """Hilo que recorre las jugadas del humano y busca la respuesta del bot."""
+
+    def __init__(self, engine, board, human, parameters):
+        self.engine = engine
+        self.board = board
+        self.human = human
+        self.parameters = parameters
+        self.stop = threading.Event()
+        # No empezar más posiciones (la que está en marcha puede acabar)
+        self.finishing = threading.Event()
+        # (clave, Event que se activa al acabarla) de la posición en marcha
+        self.current = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def replies(self):
+        """Jugadas del humano, de la más a la menos probable (según la heurística)."""
+        pos = logic.Position.from_board(self.board, self.human)
+        scored = []
+        for sq in bitboard.iter_squares(logic.legal_moves(pos)):
+            undo = logic.make_move(pos, sq)
+            score = evaluate_position(pos, self.human, "hybrid")
+            logic.unmake_move(pos, undo)
+            scored.append((-score, sq))
+        scored.sort()
+        return [bitboard.to_coords(sq) for _, sq in scored]
+
+    def run(self):
+        bot = 3 - self.human
+        for row, col in self.replies():
+            if self.stop.is_set():
+                return
+            result = logic.apply_move(self.board, row, col, self.human)
+            if result.current_turn != bot:
+                continue  # El bot tendrá que pasar o la partida acaba
+            key = _key(result.board_state, bot, self.parameters)
+            with _cache_lock:
+                if key in _cache:
+                    continue
+            if self.parameters.get("use_book", True) and book.lookup(
+                result.board_state, bot
+            ):
+                continue  # La respuesta saldrá del libro
+            if self.finishing.is_set():
+                return
+            done = threading.Event()
+            # Cuenta como búsqueda: una medición de memoria la espera
+            with search_lock.shared():
+                self.current = (key, done)
+                stats = SearchStats()
+                try:
+                    move = self.engine.get_move(
+                        result.board_state,
+                        bot,
+                        self.parameters,
+                        stop=self.stop,
+                        stats=stats,
+                    )
+                    # Una búsqueda cortada a medias no vale como respuesta
+                    if not self.stop.is_set() and move is not None:
+                        _remember(key, move, stats)
+                finally:
+                    self.current = None
+                    done.set()
+
+
+def start(game_id, engine, board, human, parameters):
+    """
+    Empieza a pensar en segundo plano las respuestas de ``engine`` a cada
+    jugada que puede hacer ``human`` en ``board``.
+    """
+    job = _PonderJob(engine, board, human, dict(parameters))
+    with _jobs_lock:
+        old = _jobs.pop(game_id, None)
+        _jobs[game_id] = job
+    if old is not None:
+        old.stop.set()
+    job.thread.start()
+
+
+def cancel(game_id):
+    with _jobs_lock:
+        job = _jobs.pop(game_id, None)
+    if job is not None:
+        job.stop.set()
+
+
+def take_move(game_id, board, player, parameters, stats=None):
+    """
+    Respuesta precalculada para esta posición o None. Detiene el pondering de
+    la partida; si justo estaba buscando esta posición, espera a que termine.
+    Si hay respuesta, ``stats`` recibe las estadísticas de su búsqueda.
+    """
+    key = _key(board, player, parameters)
+    with _jobs_lock:
+        job = _jobs.pop(game_id, None)
+    if job is not None:
+        # Primero que no empiece otra posición; luego, si la que está en marcha
+        # es esta, esperamos a que acabe (solo esa: el Event es de esa clave)
+        job.finishing.set()
+        current = job.current
+        if current is not None and current[0] == key:
+            current[1].wait()
+        job.stop.set()
+    with _cache_lock:
+        entry = _cache.pop(key, None)
+    if entry is None:
+        return None
+    move, pondered_stats = entry
+    if stats is not None:
+        stats.update(pondered_stats)
+        stats.source = "ponder"
+    return move
@@ -0,0 +1,64 @@
+import threading
+from collections import OrderedDict
+
+from app.core.config import settings
+
+
+class SearchStateCache:
+    """
+    Caché LRU, en memoria del proceso, del estado que deja cada motor al
+    terminar una jugada (tabla de transposición de alphabeta, árbol de
+    montecarlo). La clave es (id de partida, jugador), así la siguiente jugada
+    del mismo bot en la misma partida empieza en caliente.
+
+    El tamaño de cada estado lo da ``state.nbytes()`` y el total nunca pasa de
+    ``max_bytes``: se expulsan primero las partidas usadas hace más tiempo.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # clave -> (estado, bytes)
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def take(self, key):
+        """
+        Saca el estado de la caché (o None). Mientras el motor lo usa no está
+        en la caché, así que dos peticiones a la vez nunca lo comparten.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._total -= entry[1]
+            return entry[0]
+
+    def put(self, key, state) -> None:
+        size = state.nbytes()
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (state, size)
+            self._total += size
+            while self._total > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._total -= evicted
+
+    def discard_game(self, game_id) -> None:
+        """Olvida los estados de una partida (por ejemplo, al terminar)."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == game_id]:
+                self._total -= self._entries.pop(key)[1]
+
+
+search_cache = SearchStateCache(settings.SEARCH_CACHE_MB * 1024 * 1024)
@@ -0,0 +1,156 @@
+from functools import cache
+
+from app import bitboard
+
+# --- FICHAS ESTABLES ---
+# Una ficha es estable si ninguna jugada futura puede voltearla. Se calcula
+# por partes:
+#   1. Bordes: una tabla con las fichas estables de cada configuración de un
+#      borde (3^8 posibles), calculada probando todas las jugadas posibles en él.
+#   2. Interior: una ficha es estable si en cada una de sus 4 líneas (fila,
+#      columna, dos diagonales) la línea está llena o tiene al lado, en esa
+#      línea, una ficha propia estable. Se repite hasta que no cambia nada.
+# El resultado es una cota por debajo (alguna ficha estable puede faltar), así
+# que sirve para acotar el resultado final en la búsqueda.
+
+INNER = bitboard.INNER
+CORNERS = 0x8100000000000081
+
+
+def _edge_flips(me: int, opp: int, x: int) -> int:
+    """Fichas rivales que voltea jugar en ``x`` dentro de una fila de 8."""
+    flips = 0
+    for step in (-1, 1):
+        run = 0
+        y = x + step
+        while 0 <= y < 8 and opp >> y & 1:
+            run |= 1 << y
+            y += step
+        if run and 0 <= y < 8 and me >> y & 1:
+            flips |= run
+    return flips
+
+
+@cache
+def _edge_stable(me: int, opp: int) -> int:
+    """
+    Fichas de ``me`` que siguen siendo suyas en cualquier continuación del
+    borde. Se permite jugar en cualquier casilla libre (legal o no por el
+    borde: la jugada puede voltear en otra dirección), así que es prudente.
+    """
+    stable = me
+    empty = ~(me | opp) & 0xFF
+    for x in range(8):
+        if not stable:
+            break
+        if not empty >> x & 1:
+            continue
+        bit = 1 << x
+        # Juego yo en x
+        flips = _edge_flips(me, opp, x)
+        stable &= _edge_stable(me | bit | flips, opp ^ flips)
+        # Juega el rival en x
+        flips = _edge_flips(opp, me, x)
+        stable &= _edge_stable(me ^ flips, opp | bit | flips)
+    return stable
+
+
+# Fichas estables de ``me`` en una fila de borde indexada por (me << 8) | opp
+EDGE_STABLE = [
+    _edge_stable(p >> 8, p & 0xFF) if not (p >> 8) & p & 0xFF else 0
+    for p in range(1 << 16)
+]
+_edge_stable.cache_clear()
+
+
+def _off_board(rows, cols) -> int:
+    """Casillas cuyo vecino a ``rows`` filas y ``cols`` columnas se sale."""
+    mask = 0
+    for sq in range(64):
+        row, col = bitboard.to_coords(sq)
+        if not (0 <= row + rows < 8 and 0 <= col + cols < 8):
+            mask |= 1 << sq
+    return mask
+
+
+# Casillas cuyo vecino a 1, 2 y 4 saltos en cada diagonal se sale del tablero:
+# abajo a la derecha (+9), arriba a la izquierda (-9), abajo a la izquierda (+7)
+# y arriba a la derecha (-7)
+D9_DOWN = [_off_board(s, s) for s in (1, 2, 4)]
+D9_UP = [_off_board(-s, -s) for s in (1, 2, 4)]
+D7_DOWN = [_off_board(s, -s) for s in (1, 2, 4)]
+D7_UP = [_off_board(-s, s) for s in (1, 2, 4)]
+
+
+def _full_lines(filled: int):
+    """
+    Casillas cuya fila, columna y diagonales están llenas (por separado). En
+    cada paso se junta lo ya visto con lo de la casilla a 1, 2 y 4 saltos (o se
+    da por lleno si esa casilla se sale), así que bastan tres pasos por sentido.
+    """
+    h = filled & (filled >> 1)
+    h &= h >> 2
+    h &= h >> 4
+    full_h = (h & 0x0101010101010101) * 0xFF
+    v = filled & (filled >> 8)
+    v &= v >> 16
+    v &= v >> 32
+    full_v = (v & 0xFF) * 0x0101010101010101
+
+    e1, e2, e4 = D9_DOWN
+    down = filled & ((filled >> 9) | e1)
+    down &= (down >> 18) | e2
+    down &= (down >> 36) | e4
+    e1, e2, e4 = D9_UP
+    up = filled & ((filled << 9) | e1)
+    up &= (up << 18) | e2
+    up &= (up << 36) | e4
+    full_d9 = down & up
+
+    e1, e2, e4 = D7_DOWN
+    down = filled & ((filled >> 7) | e1)
+    down &= (down >> 14) | e2
+    down &= (down >> 28) | e4
+    e1, e2, e4 = D7_UP
+    up = filled & ((filled << 7) | e1)
+    up &= (up << 14) | e2
+    up &= (up << 28) | e4
+    return full_h, full_v, full_d9, down & up
+
+
+def edge_stable_discs(me: int, opp: int) -> int:
+    """Fichas estables de ``me`` en los cuatro bordes."""
+    table = EDGE_STABLE
+    stable = table[(me & 0xFF) << 8 | (opp & 0xFF)]
+    stable |= table[(me >> 56) << 8 | (opp >> 56)] << 56
+    me_t = bitboard.transpose(me)
+    opp_t = bitboard.transpose(opp)
+    columns = table[(me_t & 0xFF) << 8 | (opp_t & 0xFF)]
+    columns |= table[(me_t >> 56) << 8 | (opp_t >> 56)] << 56
+    return stable | bitboard.transpose(columns)
+
+
+def stable_discs(me: int, opp: int) -> int:
+    """Fichas de ``me`` que ya no se pueden voltear (cota por debajo)."""
+    filled = me | opp
+    # Sin esquinas ocupadas no hay bordes estables y casi nunca fichas
+    # interiores: se da 0 (sigue siendo una cota válida)
+    if not filled & CORNERS:
+        return 0
+    full_h, full_v, full_d9, full_d7 = _full_lines(filled)
+    stable = edge_stable_discs(me, opp)
+    central = me & INNER
+    stable |= central & full_h & full_v & full_d9 & full_d7
+    if not central & ~stable:
+        return stable
+
+    # Una ficha interior con cada línea llena o apoyada en una estable propia
+    while True:
+        old = stable
+        horizontal = (stable >> 1) | (stable << 1) | full_h
+        vertical = (stable >> 8) | (stable << 8) | full_v
+        diagonal = (stable >> 9) | (stable << 9) | full_d9
+        anti_diagonal = (stable >> 7) | (stable << 7) | full_d7
+        stable |= horizontal & vertical & diagonal & anti_diagonal & central
+        if stable == old:
+            return stable
@@ -0,0 +1,45 @@
+from dataclasses import asdict, dataclass
+
+# Estadísticas de búsqueda de una jugada del bot. Los motores las rellenan si
+# se les pasa un SearchStats (parámetro ``stats`` de get_move) y se guardan
+# junto a la jugada (Moves.search_stats) para poder ajustar los motores, con
+# dos medidas derivadas: nodos por segundo (nps) y proporción de cortes
+# (cutoff_rate).
+
+
+@dataclass
+class SearchStats:
+    # De dónde salió la jugada: "search", "endgame", "book", "ponder", "random"
+    # o "qlearning"
+    source: str = "search"
+    nodes: int = 0  # Nodos visitados (alphabeta y final exacto)
+    leaf_evals: int = 0  # Llamadas a la heurística en las hojas
+    tt_hits: int = 0  # Consultas a la tabla de transposición con acierto
+    cutoffs: int = 0  # Cortes beta
+    first_move_cutoffs: int = 0  # Cortes beta con la primera jugada probada
+    depth_completed: int = 0  # Última iteración completa (o casillas del final)
+    iterations: int = 0  # Iteraciones de Monte Carlo
+    tree_size: int = 0  # Nodos del árbol de Monte Carlo al terminar
+    eval_cache_hits: int = 0  # Evaluaciones servidas por la caché (eval_cache)
+    eval_cache_misses: int = 0  # Evaluaciones calculadas y guardadas en ella
+    search_time: float = 0.0  # Segundos que estuvo buscando el motor
+
+    @property
+    def nps(self) -> float:
+        """Nodos por segundo (iteraciones por segundo en Monte Carlo)."""
+        if self.search_time <= 0:
+            return 0.0
+        return (self.nodes or self.iterations) / self.search_time
+
+    @property
+    def cutoff_rate(self) -> float:
+        """Proporción de nodos que acabaron en corte beta."""
+        return self.cutoffs / self.nodes if self.nodes else 0.0
+
+    def update(self, other: "SearchStats"):
+        """Copia todos los valores de ``other`` (p. ej. los de una jugada pensada)."""
+        for name, value in asdict(other).items():
+            setattr(self, name, value)
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "nps": self.nps, "cutoff_rate": self.cutoff_rate}
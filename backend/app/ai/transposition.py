@@ -0,0 +1,198 @@
+import hashlib
+import sys
+import time
+from array import array
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+
+# Tipos de cota guardados en cada entrada (nunca 0: 0 marca entrada vacía)
+EXACT = 1  # Valor exacto dentro de la ventana (alpha, beta)
+LOWER = 2  # Falló alto (>= beta): el valor real es al menos este
+UPPER = 3  # Falló bajo (<= alpha): el valor real es como mucho este
+
+NO_MOVE = 64
+
+# Cada entrada ocupa dos enteros de 64 bits: la clave (hash Zobrist completo,
+# guardado como clave XOR datos) y los datos empaquetados:
+#   bits 32-63 puntuación (+2^31) | 24-31 profundidad | 16-23 generación
+#   bits  8-15 tipo de cota       |  0-7  mejor jugada (0-63, 64 = ninguna)
+ENTRY_BYTES = 16
+_SCORE_OFFSET = 1 << 31
+
+# La clave se guarda mezclada con los datos: si dos procesos escriben a la vez
+# la misma entrada de una tabla compartida y queda a medias (clave de uno,
+# datos de otro), la comprobación al leer falla y la entrada se ignora.
+# Así la tabla compartida no necesita cerrojos.
+
+
+def _entry_count(size_bytes: int) -> int:
+    n = max(1, size_bytes // ENTRY_BYTES)
+    return 1 << (n.bit_length() - 1)  # Potencia de 2 para indexar con máscara
+
+
+class TranspositionTable:
+    """
+    Tabla de transposición de tamaño fijo indexada por hash Zobrist.
+
+    Reemplazo por profundidad: una entrada de otra posición solo se pisa si
+    es de una búsqueda anterior (generación distinta) o si la nueva llega con
+    al menos la misma profundidad.
+    """
+
+    def __init__(self, size_mb: int = 16):
+        n = _entry_count(size_mb * 1024 * 1024)
+        self.mask = n - 1
+        self.keys = array("Q", bytes(8 * n))
+        self.data = array("Q", bytes(8 * n))
+        self.generation = 0
+
+    def new_search(self):
+        """Marca el inicio de una búsqueda: lo anterior pasa a ser reemplazable."""
+        self.generation = (self.generation + 1) & 0xFF
+
+    def clear(self):
+        n = self.mask + 1
+        self.keys = array("Q", bytes(8 * n))
+        self.data = array("Q", bytes(8 * n))
+
+    def probe(self, key: int):
+        """Devuelve (profundidad, puntuación, cota, jugada) o None."""
+        i = key & self.mask
+        d = self.data[i]
+        if not d or self.keys[i] ^ d != key:
+            return None
+        return (
+            (d >> 24) & 0xFF,
+            (d >> 32) - _SCORE_OFFSET,
+            (d >> 8) & 0xFF,
+            d & 0xFF,
+        )
+
+    def store(self, key: int, depth: int, score: int, bound: int, move: int):
+        i = key & self.mask
+        old = self.data[i]
+        if old and self.keys[i] ^ old != key:
+            same_search = ((old >> 16) & 0xFF) == self.generation
+            if same_search and ((old >> 24) & 0xFF) > depth:
+                return  # Conservamos la entrada más profunda
+        d = (
+            ((score + _SCORE_OFFSET) << 32)
+            | (depth << 24)
+            | (self.generation << 16)
+            | (bound << 8)
+            | move
+        )
+        self.keys[i] = key ^ d
+        self.data[i] = d
+
+
+# El bloque compartido empieza con una cabecera de dos enteros de 64 bits: la
+# versión del código que puntuó las entradas (ver code_fingerprint) y el número
+# de entradas. Si no coinciden con los del proceso que lo abre, se vacía.
+HEADER_WORDS = 2
+HEADER_BYTES = 8 * HEADER_WORDS
+
+
+def code_fingerprint(*modules) -> int:
+    """Huella de 64 bits del código fuente de ``modules``."""
+    digest = hashlib.blake2b(digest_size=8)
+    for module in modules:
+        digest.update(Path(module.__file__).read_bytes())
+    return int.from_bytes(digest.digest(), "little")
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    La misma tabla pero en un bloque de multiprocessing.shared_memory con
+    nombre, para que todos los procesos de búsqueda de la máquina (workers de
+    uvicorn, pool de la búsqueda paralela...) lean y escriban las mismas
+    entradas. El primero que la abre la crea.
+
+    Cerrarla no borra el bloque: otros procesos pueden seguir usándolo o
+    abrirlo más tarde (un proceso del pool que arranca después). Sigue en
+    /dev/shm hasta unlink() o hasta que se reinicie la máquina/contenedor, y
+    el siguiente arranque lo reutiliza si ``version`` coincide; si no (otro
+    código de evaluación, o un bloque a medias), lo vacía.
+
+    Las entradas solo sirven para la misma heurística: usar un nombre distinto
+    por heurística (ver shared_table_name).
+    """
+
+    def __init__(self, name: str, size_mb: int = 16, version: int = 0):
+        n = _entry_count(size_mb * 1024 * 1024)
+        self.shm, self.owner = _open_shared_memory(name, HEADER_BYTES + n * ENTRY_BYTES)
+        # Si otro proceso la creó con otro tamaño, nos adaptamos al suyo
+        n = _entry_count(self.shm.size - HEADER_BYTES)
+        view = self.shm.buf.cast("Q")
+        start = HEADER_WORDS
+        self._views = (
+            view,
+            view[:HEADER_WORDS],
+            view[start : start + n],
+            view[start + n : start + 2 * n],
+        )
+        self.header = self._views[1]
+        self.keys = self._views[2]
+        self.data = self._views[3]
+        self.mask = n - 1
+        self.generation = 0
+        self.version = version
+        if self.header[0] != version or self.header[1] != n:
+            self.clear()
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def clear(self):
+        size = (self.mask + 1) * ENTRY_BYTES
+        self.shm.buf[HEADER_BYTES : HEADER_BYTES + size] = bytes(size)
+        self.header[0] = self.version
+        self.header[1] = self.mask + 1
+
+    def close(self):
+        """Suelta el bloque (sin borrarlo: puede haber otros procesos usándolo)."""
+        for view in reversed(self._views):
+            view.release()
+        self.shm.close()
+
+    def unlink(self):
+        """Cierra y borra el bloque; quien lo abra después creará uno nuevo."""
+        self.close()
+        if _MANUAL_TRACKING:
+            # unlink() avisa al resource_tracker: tiene que constarle
+            resource_tracker.register(self.shm._name, "shared_memory")
+        self.shm.unlink()
+
+
+def shared_table_name(prefix: str, heuristic_type) -> str:
+    heuristic = getattr(heuristic_type, "value", heuristic_type)
+    return f"{prefix}_{heuristic}"
+
+
+# Antes de 3.13 todo proceso que abre un bloque lo registra en el
+# resource_tracker, que lo borra al salir ese proceso aunque otros lo sigan
+# usando. Lo quitamos del registro y lo gestionamos nosotros (close()).
+_MANUAL_TRACKING = sys.version_info < (3, 13)
+_SHM_OPTIONS = {} if _MANUAL_TRACKING else {"track": False}
+
+
+def _open_shared_memory(name: str, size: int):
+    """Crea el bloque o se engancha al existente. Devuelve (bloque, creado)."""
+    try:
+        shm = shared_memory.SharedMemory(name, create=True, size=size, **_SHM_OPTIONS)
+        created = True
+    except FileExistsError:
+        # Puede que el creador aún no le haya dado tamaño: reintentamos
+        for attempt in range(100):
+            try:
+                shm = shared_memory.SharedMemory(name, **_SHM_OPTIONS)
+                break
+            except ValueError:
+                if attempt == 99:
+                    raise
+                time.sleep(0.01)
+        created = False
+    if _MANUAL_TRACKING:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm, created
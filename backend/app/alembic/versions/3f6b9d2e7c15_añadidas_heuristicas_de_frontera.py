@@ -0,0 +1,49 @@
+"""Añadidas heurísticas de frontera
+
+Revision ID: 3f6b9d2e7c15
+Revises: e4a8c2f1d9b3
+Create Date: 2026-03-12 10:48:03.671920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6b9d2e7c15'
+down_revision = 'e4a8c2f1d9b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ADD VALUE no puede ir dentro de una transacción en Postgres < 12
+    with op.get_context().autocommit_block():
+        op.execute(
+            "ALTER TYPE aiheuristic ADD VALUE IF NOT EXISTS 'potential_mobility'"
+        )
+        op.execute("ALTER TYPE aiheuristic ADD VALUE IF NOT EXISTS 'hybrid_frontier'")
+
+
+def downgrade():
+    # Postgres no permite quitar valores de un enum: se recrea el tipo
+    op.execute(
+        "UPDATE aiconfig SET heuristic = 'hybrid' "
+        "WHERE heuristic IN ('potential_mobility', 'hybrid_frontier')"
+    )
+    op.execute("ALTER TYPE aiheuristic RENAME TO aiheuristic_old")
+    aiheuristic_enum = sa.Enum(
+        "static_weights",
+        "mobility_based",
+        "hybrid",
+        "none",
+        "pattern",
+        name="aiheuristic",
+    )
+    aiheuristic_enum.create(op.get_bind())
+    op.execute(
+        "ALTER TABLE aiconfig ALTER COLUMN heuristic TYPE aiheuristic "
+        "USING heuristic::text::aiheuristic"
+    )
+    op.execute("DROP TYPE aiheuristic_old")
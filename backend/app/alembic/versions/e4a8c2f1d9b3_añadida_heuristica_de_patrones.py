@@ -0,0 +1,44 @@
+"""Añadida heurística de patrones
+
+Revision ID: e4a8c2f1d9b3
+Revises: b7d3f0e41a92
+Create Date: 2026-03-09 17:26:48.193562
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a8c2f1d9b3'
+down_revision = 'b7d3f0e41a92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ADD VALUE no puede ir dentro de una transacción en Postgres < 12
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE aiheuristic ADD VALUE IF NOT EXISTS 'pattern'")
+
+
+def downgrade():
+    # Postgres no permite quitar valores de un enum: se recrea el tipo
+    op.execute(
+        "UPDATE aiconfig SET heuristic = 'static_weights' WHERE heuristic = 'pattern'"
+    )
+    op.execute("ALTER TYPE aiheuristic RENAME TO aiheuristic_old")
+    aiheuristic_enum = sa.Enum(
+        "static_weights",
+        "mobility_based",
+        "hybrid",
+        "none",
+        name="aiheuristic",
+    )
+    aiheuristic_enum.create(op.get_bind())
+    op.execute(
+        "ALTER TABLE aiconfig ALTER COLUMN heuristic TYPE aiheuristic "
+        "USING heuristic::text::aiheuristic"
+    )
+    op.execute("DROP TYPE aiheuristic_old")
@@ -3,6 +3,7 @@ import uuid
 from typing import Any, List
 
 from app import ai, crud, logic
+from app.ai.stats import SearchStats
 from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
 from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
@@ -14,6 +15,7 @@ from app.models import (
     GamePublic,
     GamesPublic,
     GameStateResult,
+    MeasureLevel,
     MoveCreate,
     Moves,
     Turn,
@@ -224,8 +226,10 @@ def human_move(
     )
     session.add(new_move)
 
-    result: GameStateResult = logic.apply_move(
-        game.board_state, move.coordinate[0], move.coordinate[1], player
+    result = GameStateResult.model_validate(
+        logic.apply_move(
+            game.board_state, move.coordinate[0], move.coordinate[1], player
+        )._asdict()
     )
     game.board_state = result.board_state
     game.score_black = result.score_black
@@ -238,6 +242,8 @@ def human_move(
         game.current_turn = Turn.BLACK
     elif result.current_turn == 2:
         game.current_turn = Turn.WHITE
+    if game.winner is not None:
+        ai.forget_game(game.id)
     session.add(game)
     session.commit()
     session.refresh(game)
@@ -246,10 +252,15 @@ def human_move(
 
 @router.post("/{game_id}/bot-move/", response_model=BotMoveResponse)
 def make_bot_move(
-    *, session: SessionDep, game_id: uuid.UUID, current_user: CurrentUser
+    *,
+    session: SessionDep,
+    game_id: uuid.UUID,
+    current_user: CurrentUser,
+    measure: MeasureLevel = MeasureLevel.TIME,
 ) -> BotMoveResponse:
     """
-    Make a move in the game.
+    Make a move in the game. ``measure`` chooses what is measured (memory
+    tracing makes the search much slower).
     """
     statement = select(Game).where(Game.id == game_id).with_for_update()
     game = session.exec(statement).one_or_none()
@@ -275,16 +286,22 @@ def make_bot_move(
         raise HTTPException(status_code=400, detail="No AI configured for this player")
     ai_params = dict(ai_config.parameters) if ai_config.parameters else {}
     ai_params["heuristic"] = ai_config.heuristic
-    move_coords, time_taken, memory_mb = ai.select_best_move(
+    stats = SearchStats()
+    move_coords, perf = ai.select_best_move(
         board=game.board_state,
         player=player,
         algorithm=ai_config.algorithm,
         parameters=ai_params,
+        game_id=game.id,
+        stats=stats,
+        measure=measure,
     )
 
     if move_coords:
-        result = logic.apply_move(
-            game.board_state, move_coords[0], move_coords[1], player
+        result = GameStateResult.model_validate(
+            logic.apply_move(
+                game.board_state, move_coords[0], move_coords[1], player
+            )._asdict()
         )
         game.board_state = result.board_state
         game.score_black = result.score_black
@@ -303,11 +320,15 @@ def make_bot_move(
             move_number=len(game.moves) + 1,
             player=Turn.BLACK if player == 1 else Turn.WHITE,
             position=move_coords,
-            execution_time=time_taken,
-            memory_used=memory_mb,
+            execution_time=perf.execution_time,
+            cpu_time=perf.cpu_time,
+            memory_used=perf.memory_mb,
+            search_stats=stats.as_dict(),
         )
         session.add(new_move)
-        message = f"{ai_config.algorithm.value} movió a {move_coords} ({time_taken:.3f}s, {memory_mb:.2f}MB)"
+        message = f"{ai_config.algorithm.value} movió a {move_coords}"
+        if perf.execution_time is not None:
+            message += f" ({perf.summary()})"
 
     else:
         opponent = 3 - player
@@ -320,8 +341,9 @@ def make_bot_move(
                     game_id=game.id,
                     player=Turn.BLACK if player == 1 else Turn.WHITE,
                     position=None,
-                    execution_time=time_taken,
-                    memory_used=memory_mb,
+                    execution_time=perf.execution_time,
+                    cpu_time=perf.cpu_time,
+                    memory_used=perf.memory_mb,
                 )
             )
             message = f"AI no pudo mover y pasó el turno"
@@ -333,6 +355,16 @@ def make_bot_move(
             else:
                 game.winner = Winner.DRAW
             message = "Fin de la partida (ningún jugador puede mover)"
+    if game.winner is not None:
+        ai.forget_game(game.id)
+    elif (
+        game.bot_black if game.current_turn == Turn.BLACK else game.bot_white
+    ) is None:
+        # Le toca a un humano: el bot puede ir pensando su respuesta
+        human = 1 if game.current_turn == Turn.BLACK else 2
+        ai.start_pondering(
+            game.id, game.board_state, human, ai_config.algorithm, ai_params
+        )
     session.add(game)
     session.commit()
     session.refresh(game)
@@ -340,8 +372,10 @@ def make_bot_move(
         game=GamePublic.model_validate(game),
         move_made=move_coords,
         message=message,
-        execution_time=time_taken,
-        memory_peak_mb=memory_mb,
+        execution_time=perf.execution_time,
+        cpu_time=perf.cpu_time,
+        memory_peak_mb=perf.memory_mb,
+        search_stats=stats.as_dict() if move_coords else None,
     )
 
 
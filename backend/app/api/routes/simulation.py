@@ -5,6 +5,7 @@ from typing import Any
 
 from app import ai, logic
 from app.ai import alphabeta, montecarlo
+from app.ai.stats import SearchStats
 from app.api.deps import CurrentUser, SessionDep
 from app.core.db import engine
 from app.models import (
@@ -106,7 +107,6 @@ def run_simulation_task(simulation_id: uuid.UUID, request: SimulationRequest):
                 board = game_db.board_state
                 current_turn = 1
                 game_over = False
-                consecutive_passes = 0
 
                 move_counter = 0
 
@@ -126,12 +126,29 @@ def run_simulation_task(simulation_id: uuid.UUID, request: SimulationRequest):
 
                     # B. LLAMADA CRÍTICA: Aquí obtenemos Tiempo y RAM
                     # move_coords: [fila, col] o None
-                    # time_taken: float (segundos)
-                    # memory_mb: float (MB)
-                    move_coords, time_taken, memory_mb = ai.select_best_move(
-                        board=board, player=player_id, algorithm=algo, parameters=params
+                    # perf: Measurement (tiempos en segundos, memoria en MB;
+                    # lo que no pida request.measure queda a None)
+                    stats = SearchStats()
+                    move_coords, perf = ai.select_best_move(
+                        board=board,
+                        player=player_id,
+                        algorithm=algo,
+                        parameters=params,
+                        game_id=game_db.id,
+                        stats=stats,
+                        measure=request.measure,
                     )
 
+                    if move_coords is None:
+                        # Sin jugadas: ¿pase o fin de partida? apply_move ya no lo
+                        # resuelve, así que reutilizamos la lista vacía que conocemos.
+                        next_turn, winner = logic.game_status(board, player_id, [])
+                        if winner:
+                            game_over = True
+                            results[winner] += 1
+                            game_db.winner = Winner(winner)
+                            continue
+
                     # C. GUARDAR EL MOVIMIENTO CON ESTADÍSTICAS
                     # Guardamos INCLUSO si es un "Pass" (move_coords es None),
                     # porque tu tutor querrá saber cuánto tardó la IA en decidir pasar.
@@ -141,16 +158,23 @@ def run_simulation_task(simulation_id: uuid.UUID, request: SimulationRequest):
                         player=Turn.BLACK if player_id == 1 else Turn.WHITE,
                         position=move_coords,
                         # --- DATOS DEL TFG ---
-                        execution_time=time_taken,
-                        memory_used=memory_mb,
+                        execution_time=perf.execution_time,
+                        cpu_time=perf.cpu_time,
+                        memory_used=perf.memory_mb,
+                        search_stats=stats.as_dict() if move_coords else None,
                     )
                     session.add(new_move)
 
                     # D. APLICAR LÓGICA DE JUEGO
                     if move_coords:
-                        consecutive_passes = 0
+                        # Sin resolver pases: el siguiente select_best_move ya
+                        # genera las jugadas del rival y detecta si no tiene.
                         res = logic.apply_move(
-                            board, move_coords[0], move_coords[1], player_id
+                            board,
+                            move_coords[0],
+                            move_coords[1],
+                            player_id,
+                            resolve_turn=False,
                         )
 
                         # Actualizamos estado visual de la partida
@@ -158,57 +182,21 @@ def run_simulation_task(simulation_id: uuid.UUID, request: SimulationRequest):
                         game_db.board_state = res.board_state
                         game_db.score_black = res.score_black
                         game_db.score_white = res.score_white
-
-                        if res.winner:
-                            game_over = True
-                            if res.winner == "black":
-                                results["black"] += 1
-                                game_db.winner = Winner.BLACK
-                            elif res.winner == "white":
-                                results["white"] += 1
-                                game_db.winner = Winner.WHITE
-                            else:
-                                results["draw"] += 1
-                                game_db.winner = Winner.DRAW
-                        elif res.current_turn:
-                            current_turn = res.current_turn
-                            game_db.current_turn = (
-                                Turn.BLACK if current_turn == 1 else Turn.WHITE
-                            )
-                        else:
-                            game_over = True
+                        current_turn = res.current_turn
                     else:
                         # Lógica de Pasar Turno
-                        consecutive_passes += 1
-                        if consecutive_passes >= 2:
-                            game_over = True
-                            # Calcular ganador por conteo final...
-                            # (Lógica de conteo igual que antes)
-                            b_c = sum(r.count(1) for r in board)
-                            w_c = sum(r.count(2) for r in board)
-                            game_db.score_black = b_c
-                            game_db.score_white = w_c
-
-                            if b_c > w_c:
-                                results["black"] += 1
-                                game_db.winner = Winner.BLACK
-                            elif w_c > b_c:
-                                results["white"] += 1
-                                game_db.winner = Winner.WHITE
-                            else:
-                                results["draw"] += 1
-                                game_db.winner = Winner.DRAW
-                        else:
-                            current_turn = 3 - current_turn
-                            game_db.current_turn = (
-                                Turn.BLACK if current_turn == 1 else Turn.WHITE
-                            )
+                        current_turn = next_turn
+
+                    game_db.current_turn = (
+                        Turn.BLACK if current_turn == 1 else Turn.WHITE
+                    )
 
                     # Guardamos estado intermedio del juego (Opcional: hacer commit aquí ralentiza mucho)
                     session.add(game_db)
 
                 # FIN DE LA PARTIDA: Hacemos commit de todos los Moves y el Game final
                 session.commit()
+                ai.forget_game(game_db.id)
 
                 # Actualizar progreso global de la simulación
                 sim_db.black_wins = results["black"]
@@ -0,0 +1,174 @@
+"""
+Motor de bitboards para Reversi.
+
+Cada posición se representa con dos enteros de 64 bits (uno por jugador).
+La casilla (fila, columna) corresponde al bit ``fila * 8 + columna``, de modo
+que recorrer los bits de menor a mayor equivale a recorrer el tablero por filas.
+"""
+
+FULL = 0xFFFFFFFFFFFFFFFF
+
+# Máscaras para evitar que los desplazamientos "den la vuelta" entre filas
+NOT_EDGE_COLUMNS = 0x7E7E7E7E7E7E7E7E  # Sin columnas 0 y 7
+NOT_EDGE_ROWS = 0x00FFFFFFFFFFFF00  # Sin filas 0 y 7
+INNER = 0x007E7E7E7E7E7E00  # Sin ningún borde
+NOT_COLUMN_0 = 0xFEFEFEFEFEFEFEFE
+NOT_COLUMN_7 = 0x7F7F7F7F7F7F7F7F
+
+# (desplazamiento, máscara de fichas rivales que pueden quedar encerradas)
+# 1 = horizontal, 8 = vertical, 7 y 9 = diagonales
+SHIFTS = ((1, NOT_EDGE_COLUMNS), (8, NOT_EDGE_ROWS), (7, INNER), (9, INNER))
+
+
+def square(row: int, col: int) -> int:
+    return row * 8 + col
+
+
+def to_coords(sq: int) -> tuple[int, int]:
+    return sq >> 3, sq & 7
+
+
+def from_board(board: list[list[int]]) -> tuple[int, int]:
+    """Convierte la matriz 8x8 (0 vacío, 1 negras, 2 blancas) en (negras, blancas)."""
+    black = 0
+    white = 0
+    bit = 1
+    for row in board:
+        for cell in row:
+            if cell == 1:
+                black |= bit
+            elif cell == 2:
+                white |= bit
+            bit <<= 1
+    return black, white
+
+
+def to_board(black: int, white: int) -> list[list[int]]:
+    """Convierte un par de bitboards de vuelta a la matriz 8x8 de la API."""
+    board = []
+    bit = 1
+    for _ in range(8):
+        row = []
+        for _ in range(8):
+            if black & bit:
+                row.append(1)
+            elif white & bit:
+                row.append(2)
+            else:
+                row.append(0)
+            bit <<= 1
+        board.append(row)
+    return board
+
+
+def get_moves(me: int, opp: int) -> int:
+    """
+    Máscara con todas las casillas donde ``me`` puede jugar.
+    Propaga en las 8 direcciones a la vez (relleno "dumb7fill").
+    """
+    empty = ~(me | opp) & FULL
+    moves = 0
+    for shift, mask in SHIFTS:
+        w = opp & mask
+
+        # Sentido positivo (hacia bits más altos)
+        t = w & (me << shift)
+        t |= w & (t << shift)
+        t |= w & (t << shift)
+        t |= w & (t << shift)
+        t |= w & (t << shift)
+        t |= w & (t << shift)
+        moves |= t << shift
+
+        # Sentido negativo (hacia bits más bajos)
+        t = w & (me >> shift)
+        t |= w & (t >> shift)
+        t |= w & (t >> shift)
+        t |= w & (t >> shift)
+        t |= w & (t >> shift)
+        t |= w & (t >> shift)
+        moves |= t >> shift
+
+    return moves & empty
+
+
+def neighbours(x: int) -> int:
+    """Casillas adyacentes (en las 8 direcciones) a alguna casilla de ``x``."""
+    east = (x << 1) & NOT_COLUMN_0
+    west = (x >> 1) & NOT_COLUMN_7
+    row = x | east | west
+    return (east | west | (row << 8) | (row >> 8)) & FULL
+
+
+def get_flips(me: int, opp: int, sq: int) -> int:
+    """Máscara de fichas rivales que se voltean al jugar ``me`` en ``sq``."""
+    flips = 0
+    x = 1 << sq
+    for shift, mask in SHIFTS:
+        w = opp & mask
+
+        line = 0
+        t = (x << shift) & w
+        while t:
+            line |= t
+            t = (t << shift) & w
+        # La racha solo cuenta si termina en una ficha propia
+        if line and ((line << shift) & ~line) & me:
+            flips |= line
+
+        line = 0
+        t = (x >> shift) & w
+        while t:
+            line |= t
+            t = (t >> shift) & w
+        if line and ((line >> shift) & ~line) & me:
+            flips |= line
+
+    return flips
+
+
+def iter_squares(mask: int):
+    """Recorre los índices de los bits activos en orden ascendente."""
+    while mask:
+        bit = mask & -mask
+        yield bit.bit_length() - 1
+        mask ^= bit
+
+
+def to_coord_list(mask: int) -> list[tuple[int, int]]:
+    return [(sq >> 3, sq & 7) for sq in iter_squares(mask)]
+
+
+# --- SIMETRÍAS ---
+def mirror(x: int) -> int:
+    """Refleja columnas (columna c -> 7 - c)."""
+    x = ((x >> 1) & 0x5555555555555555) | ((x & 0x5555555555555555) << 1)
+    x = ((x >> 2) & 0x3333333333333333) | ((x & 0x3333333333333333) << 2)
+    return ((x >> 4) & 0x0F0F0F0F0F0F0F0F) | ((x & 0x0F0F0F0F0F0F0F0F) << 4)
+
+
+def flip(x: int) -> int:
+    """Refleja filas (fila r -> 7 - r)."""
+    return int.from_bytes(x.to_bytes(8, "little"), "big")
+
+
+def transpose(x: int) -> int:
+    """Refleja por la diagonal principal ((r, c) -> (c, r))."""
+    t = 0x0F0F0F0F00000000 & (x ^ (x << 28))
+    x ^= t ^ (t >> 28)
+    t = 0x3333000033330000 & (x ^ (x << 14))
+    x ^= t ^ (t >> 14)
+    t = 0x5500550055005500 & (x ^ (x << 7))
+    x ^= t ^ (t >> 7)
+    return x & FULL
+
+
+def transform(x: int, t: int) -> int:
+    """Aplica la simetría ``t`` (0-7, 0 = identidad) a un bitboard."""
+    if t & 1:
+        x = mirror(x)
+    if t & 2:
+        x = flip(x)
+    if t & 4:
+        x = transpose(x)
+    return x
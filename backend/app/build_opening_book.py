@@ -0,0 +1,81 @@
+import argparse
+import logging
+from itertools import groupby
+
+from sqlmodel import Session, col, select
+
+from app import bitboard
+from app.ai import alphabeta, book
+from app.core.db import engine
+from app.models import Game, Moves
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def mine_games(session: Session, builder: book.BookBuilder) -> int:
+    """Añade al libro todas las partidas terminadas de la BD."""
+    winners = {
+        game_id: winner.value
+        for game_id, winner in session.exec(
+            select(Game.id, Game.winner).where(col(Game.winner).is_not(None))
+        )
+    }
+    rows = session.exec(
+        select(Moves.game_id, Moves.position)
+        .where(col(Moves.move_number) <= builder.max_plies)
+        .order_by(Moves.game_id, Moves.move_number)
+    )
+    games = 0
+    for game_id, moves in groupby(rows, key=lambda row: row[0]):
+        if game_id in winners:
+            builder.add_game([position for _, position in moves], winners[game_id])
+            games += 1
+    return games
+
+
+def search_openings(builder: book.BookBuilder, plies: int, depth: int) -> int:
+    """Busca a ``depth`` todas las posiciones de las primeras ``plies`` jugadas."""
+    positions = book.reachable_positions(plies)
+    params = {"depth": depth, "heuristic": "hybrid", "time_limit_ms": None}
+    for i, (me, opp) in enumerate(sorted(positions)):
+        if not bitboard.get_moves(me, opp):
+            continue
+        move = alphabeta.get_move(bitboard.to_board(me, opp), 1, params)
+        builder.add_search(me, opp, bitboard.square(*move))
+        if i % 100 == 0:
+            logger.info("Buscadas %d/%d posiciones", i, len(positions))
+    return len(positions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Genera el libro de aperturas")
+    parser.add_argument("output", help="Fichero de salida (OPENING_BOOK_PATH)")
+    parser.add_argument("--max-plies", type=int, default=book.MAX_BOOK_PLIES)
+    parser.add_argument(
+        "--min-games", type=int, default=2, help="Partidas mínimas por jugada"
+    )
+    parser.add_argument(
+        "--search-plies",
+        type=int,
+        default=0,
+        help="Además, buscar todas las posiciones hasta esta jugada",
+    )
+    parser.add_argument("--search-depth", type=int, default=6)
+    args = parser.parse_args()
+
+    builder = book.BookBuilder(args.max_plies)
+    with Session(engine) as session:
+        games = mine_games(session, builder)
+    logger.info("Partidas minadas: %d", games)
+    if args.search_plies:
+        searched = search_openings(builder, args.search_plies, args.search_depth)
+        logger.info("Posiciones buscadas: %d", searched)
+
+    records = builder.records(args.min_games)
+    book.write_book(args.output, records)
+    logger.info("Libro escrito en %s con %d posiciones", args.output, len(records))
+
+
+if __name__ == "__main__":
+    main()
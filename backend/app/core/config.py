@@ -1,3 +1,4 @@
+import os
 import secrets
 import warnings
 from typing import Annotated, Any, Literal
@@ -90,6 +91,27 @@ class Settings(BaseSettings):
     def emails_enabled(self) -> bool:
         return bool(self.SMTP_HOST and self.EMAILS_FROM_EMAIL)
 
+    # Tabla de transposición de alphabeta en memoria compartida (MB por
+    # heurística) para todos los procesos de la máquina. 0 = cada búsqueda
+    # usa su propia tabla. En Docker /dev/shm es de 64 MB salvo que se
+    # amplíe con shm_size. El bloque se queda en /dev/shm al salir (se
+    # reutiliza si no ha cambiado el código de evaluación).
+    SHARED_TT_MB: int = 0
+    # Memoria máxima para guardar el estado de búsqueda de cada partida entre
+    # jugadas del bot (tablas de alphabeta, árboles de montecarlo)
+    SEARCH_CACHE_MB: int = 256
+    # Máximo de MB de la tabla de transposición de una búsqueda (tt_size_mb),
+    # que se reserva en cada jugada que no reutiliza la de la partida
+    MAX_TT_MB: int = 64
+    # Caché de evaluaciones de la heurística por búsqueda (MB, 0 = sin caché).
+    # Las búsquedas de una misma partida la reutilizan (va en su estado)
+    EVAL_CACHE_MB: int = 4
+    # Máximo de procesos del pool de la búsqueda paralela de alphabeta, pida lo
+    # que pida cada partida (parallel_workers): el pool es de todo el proceso
+    MAX_SEARCH_WORKERS: int = os.cpu_count() or 1
+    # Libro de aperturas generado con app/build_opening_book.py (None = sin libro)
+    OPENING_BOOK_PATH: str | None = None
+
     EMAIL_TEST_USER: EmailStr = "test@example.com"
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
@@ -1,127 +1,306 @@
-from typing import List, Optional, Tuple
+import random
+from typing import NamedTuple
 
-from app.models import GameStateResult
+from app import bitboard
 
-# Constantes para direcciones (Norte, Noreste, Este, etc.)
-DIRECTIONS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+# Internamente el motor trabaja con bitboards (ver app/bitboard.py).
+# La matriz 8x8 solo se usa como formato de entrada/salida de la API y la BD.
 
 
-def get_valid_moves(board: List[List[int]], player: int) -> List[Tuple[int, int]]:
+class MoveResult(NamedTuple):
     """
-    Recibe el tablero crudo (matriz 8x8) y el jugador (1 o 2).
-    Devuelve lista de coordenadas [(2, 3), (4, 5)] validas.
+    Resultado interno de apply_move. Tupla ligera con los mismos campos que
+    app.models.GameStateResult, que solo se valida en las rutas de la API.
     """
-    valid_moves = []
-    opponent = 3 - player  # Si soy 1, oponente es 2. Si soy 2, oponente es 1.
-
-    rows = len(board)
-    cols = len(board[0])
-
-    for row in range(rows):
-        for column in range(cols):
-            # Solo revisamos casillas vacías
-            if board[row][column] != 0:
-                continue
 
-            # Revisar las 8 direcciones para ver si encerramos fichas
-            for rowDirection, columnDirection in DIRECTIONS:
-                if _can_flip_in_direction(
-                    board, row, column, rowDirection, columnDirection, player, opponent
-                ):
-                    valid_moves.append((row, column))
-                    break  # Con que sea valido en una direccion basta
+    board_state: list[list[int]]
+    score_black: int
+    score_white: int
+    current_turn: int | None  # 1, 2, o None (Game Over)
+    winner: str | None  # "black", "white", "draw" o None
 
-    return valid_moves
 
+def _player_bitboards(board: list[list[int]], player: int) -> tuple[int, int]:
+    """Devuelve (mis fichas, fichas rivales) para el jugador indicado."""
+    black, white = bitboard.from_board(board)
+    if player == 1:
+        return black, white
+    return white, black
 
-def _can_flip_in_direction(
-    board, row, column, rowDirection, columnDirection, player, opponent
-):
-    # Lógica auxiliar privada para verificar flanqueo
-    newRow = row + rowDirection
-    newColumn = column + columnDirection
-    found_opponent = False
 
-    while 0 <= newRow < 8 and 0 <= newColumn < 8:
-        cell = board[newRow][newColumn]
-        if cell == opponent:
-            found_opponent = True
-        elif cell == player:
-            return found_opponent  # Valido solo si hay oponentes en medio
-        else:
-            return False  # Casilla vacia rompe la linea
-        newRow += rowDirection
-        newColumn += columnDirection
-
-    return False
+def get_valid_moves(board: list[list[int]], player: int) -> list[tuple[int, int]]:
+    """
+    Recibe el tablero crudo (matriz 8x8) y el jugador (1 o 2).
+    Devuelve lista de coordenadas [(2, 3), (4, 5)] validas.
+    """
+    me, opp = _player_bitboards(board, player)
+    return bitboard.to_coord_list(bitboard.get_moves(me, opp))
 
 
-def validate_move(board: List[List[int]], row: int, column: int, player: int) -> bool:
+def validate_move(board: list[list[int]], row: int, column: int, player: int) -> bool:
     """
     Valida si una jugada es legal.
     """
     if board[row][column] != 0:
         return False  # La casilla debe estar vacía
 
-    opponent = 3 - player
+    me, opp = _player_bitboards(board, player)
+    return bitboard.get_flips(me, opp, bitboard.square(row, column)) != 0
+
+
+def _resolve_turn(
+    me: int, opp: int, player: int, moves: int | None = None
+) -> tuple[int | None, str | None]:
+    """
+    Le toca a ``player`` (fichas ``me``): decide quién mueve realmente y si hay
+    ganador. ``moves`` permite reutilizar sus jugadas si ya se generaron.
+    """
+    if moves is None:
+        moves = bitboard.get_moves(me, opp)
+    if moves:
+        return player, None
 
-    for rowDirection, columnDirection in DIRECTIONS:
-        if _can_flip_in_direction(
-            board, row, column, rowDirection, columnDirection, player, opponent
-        ):
-            return True  # Si es valido en alguna direccion, la jugada es valida
+    # Si el jugador NO puede mover, ¿puede mover el rival? (PASS)
+    if bitboard.get_moves(opp, me):
+        return 3 - player, None
 
-    return False
+    # Nadie puede mover: GAME OVER
+    my_count = me.bit_count()
+    op_count = opp.bit_count()
+    if my_count == op_count:
+        return None, "draw"
+    black_wins = (my_count > op_count) == (player == 1)
+    return None, "black" if black_wins else "white"
 
 
-def apply_move(board: List[List[int]], row: int, col: int, player: int) -> dict:
+def game_status(
+    board: list[list[int]],
+    player: int,
+    valid_moves: list[tuple[int, int]] | None = None,
+) -> tuple[int | None, str | None]:
     """
-    Ejecuta un movimiento, voltea fichas y calcula el siguiente estado.
-    Retorna un diccionario con todo lo necesario para actualizar la BD.
+    Consulta barata de estado cuando le toca a ``player``.
+    Devuelve (turno real, ganador) igual que apply_move: turno None si la
+    partida terminó. Si ya se tienen sus jugadas, pasarlas en ``valid_moves``
+    para no volver a generarlas.
     """
-    # 1. Crear una copia profunda del tablero para no mutar el original por error
-    new_board = [r[:] for r in board]
-    new_board[row][col] = player
+    me, opp = _player_bitboards(board, player)
+    moves = None if valid_moves is None else len(valid_moves)
+    return _resolve_turn(me, opp, player, moves)
+
 
+def apply_move(
+    board: list[list[int]],
+    row: int,
+    col: int,
+    player: int,
+    resolve_turn: bool = True,
+) -> MoveResult:
+    """
+    Ejecuta un movimiento, voltea fichas y calcula el siguiente estado.
+    Retorna un MoveResult con todo lo necesario para actualizar la BD.
+
+    Con ``resolve_turn=False`` no se comprueban pases ni fin de partida:
+    ``current_turn`` es siempre el rival y ``winner`` None. Pensado para quien
+    va a generar enseguida las jugadas del siguiente jugador (ver game_status).
+    """
+    me, opp = _player_bitboards(board, player)
     opponent = 3 - player
 
-    # 2. Voltear fichas (FLIP)
-    for dr, dc in DIRECTIONS:
-        if _can_flip_in_direction(new_board, row, col, dr, dc, player, opponent):
-            r, c = row + dr, col + dc
-            # Avanzar volteando hasta encontrar mi propia ficha
-            while new_board[r][c] == opponent:
-                new_board[r][c] = player
-                r += dr
-                c += dc
-
-    # 3. Recalcular Scores
-    score_black = sum(row.count(1) for row in new_board)
-    score_white = sum(row.count(2) for row in new_board)
-
-    # 4. Determinar Siguiente Turno (Lógica de "Pasar")
+    # 1. Colocar ficha y voltear (FLIP)
+    flips = bitboard.get_flips(me, opp, bitboard.square(row, col))
+    me |= flips | (1 << bitboard.square(row, col))
+    opp ^= flips
+
+    black, white = (me, opp) if player == 1 else (opp, me)
+
+    # 2. Recalcular Scores
+    score_black = black.bit_count()
+    score_white = white.bit_count()
+
+    # 3. Determinar Siguiente Turno (Lógica de "Pasar")
     next_player = opponent
     winner = None
+    if resolve_turn:
+        next_player, winner = _resolve_turn(opp, me, opponent)
 
-    # ¿El oponente tiene movimientos validos?
-    if not get_valid_moves(new_board, next_player):
-        # Si el oponente NO puede mover, ¿puedo mover yo de nuevo?
-        if get_valid_moves(new_board, player):
-            next_player = player  # El oponente pierde turno (PASS)
-        else:
-            # Nadie puede mover: GAME OVER
-            next_player = None
-            if score_black > score_white:
-                winner = "black"  # O usar tu Enum Winner.BLACK
-            elif score_white > score_black:
-                winner = "white"
-            else:
-                winner = "draw"
-
-    return GameStateResult(
-        board_state=new_board,
+    return MoveResult(
+        board_state=bitboard.to_board(black, white),
         score_black=score_black,
         score_white=score_white,
         current_turn=next_player,
         winner=winner,
     )
+
+
+# --- API PARA MOTORES DE BÚSQUEDA ---
+# Los motores (alphabeta, montecarlo) recorren el árbol modificando una única
+# Position en sitio con make_move/unmake_move, en lugar de copiar el tablero
+# y construir un GameStateResult en cada nodo.
+
+
+# --- HASH ZOBRIST ---
+# Una clave aleatoria de 64 bits por (jugador, casilla) y otra para "mueven
+# blancas". La semilla es fija para que el hash de una posición sea el mismo en
+# todos los procesos (tablas compartidas, libro de aperturas...).
+_zobrist_rng = random.Random(0x5EED0F0E11)
+ZOBRIST = [
+    [0] * 64,
+    [_zobrist_rng.getrandbits(64) for _ in range(64)],
+    [_zobrist_rng.getrandbits(64) for _ in range(64)],
+]
+ZOBRIST_WHITE_TO_MOVE = _zobrist_rng.getrandbits(64)
+# Voltear una ficha cambia su color: equivale a XOR con ambas claves
+ZOBRIST_FLIP = [ZOBRIST[1][sq] ^ ZOBRIST[2][sq] for sq in range(64)]
+
+
+# --- MAPA DE CALOR ESTÁTICO ---
+# Esquinas (100) valiosas, casillas X (-20/-50) peligrosas.
+POSITION_WEIGHTS = [
+    [100, -20, 10, 5, 5, 10, -20, 100],
+    [-20, -50, -2, -2, -2, -2, -50, -20],
+    [10, -2, 5, 1, 1, 5, -2, 10],
+    [5, -2, 1, 2, 2, 1, -2, 5],
+    [5, -2, 1, 2, 2, 1, -2, 5],
+    [10, -2, 5, 1, 1, 5, -2, 10],
+    [-20, -50, -2, -2, -2, -2, -50, -20],
+    [100, -20, 10, 5, 5, 10, -20, 100],
+]
+
+# Mismos pesos indexados por casilla (fila * 8 + columna) para los bitboards
+SQUARE_WEIGHTS = [w for row in POSITION_WEIGHTS for w in row]
+
+
+def positional_score(discs: int) -> int:
+    """Suma del mapa de calor sobre las casillas de ``discs``."""
+    weights = SQUARE_WEIGHTS
+    return sum(weights[sq] for sq in bitboard.iter_squares(discs))
+
+
+def zobrist_hash(black: int, white: int, turn: int) -> int:
+    """Hash Zobrist completo de una posición (incluye el turno)."""
+    h = ZOBRIST_WHITE_TO_MOVE if turn == 2 else 0
+    for sq in bitboard.iter_squares(black):
+        h ^= ZOBRIST[1][sq]
+    for sq in bitboard.iter_squares(white):
+        h ^= ZOBRIST[2][sq]
+    return h
+
+
+class Position:
+    """
+    Posición mutable en bitboards. ``discs[1]`` son las negras y ``discs[2]``
+    las blancas (indexadas por id de jugador); ``turn`` es quien mueve.
+    ``counts`` lleva el número de fichas de cada jugador, ``positional`` la
+    suma del mapa de calor de sus fichas y ``hash`` el hash Zobrist; todos se
+    actualizan en cada jugada a partir de las fichas volteadas.
+    """
+
+    __slots__ = ("discs", "counts", "positional", "turn", "hash")
+
+    def __init__(self, black: int, white: int, turn: int):
+        self.discs = [0, black, white]
+        self.counts = [0, black.bit_count(), white.bit_count()]
+        self.positional = [0, positional_score(black), positional_score(white)]
+        self.turn = turn
+        self.hash = zobrist_hash(black, white, turn)
+
+    @classmethod
+    def from_board(cls, board: list[list[int]], turn: int) -> "Position":
+        black, white = bitboard.from_board(board)
+        return cls(black, white, turn)
+
+    def to_board(self) -> list[list[int]]:
+        return bitboard.to_board(self.discs[1], self.discs[2])
+
+    def copy(self) -> "Position":
+        other = Position.__new__(Position)
+        other.discs = self.discs[:]
+        other.counts = self.counts[:]
+        other.positional = self.positional[:]
+        other.turn = self.turn
+        other.hash = self.hash
+        return other
+
+    def empties(self) -> int:
+        return 64 - self.counts[1] - self.counts[2]
+
+    def disc_difference(self, player: int) -> int:
+        """Fichas de ``player`` menos fichas del rival."""
+        return self.counts[player] - self.counts[3 - player]
+
+
+def legal_moves(pos: Position) -> int:
+    """Máscara de jugadas legales para el jugador al que le toca."""
+    player = pos.turn
+    return bitboard.get_moves(pos.discs[player], pos.discs[3 - player])
+
+
+def make_move(pos: Position, sq: int) -> tuple[int, int, int, int]:
+    """
+    Juega en la casilla ``sq`` (0-63) para ``pos.turn`` y cede el turno al rival.
+    No resuelve pases ni fin de partida: eso queda a cargo del motor.
+    Devuelve el registro para deshacer la jugada con unmake_move.
+    """
+    player = pos.turn
+    opponent = 3 - player
+    discs = pos.discs
+    flips = bitboard.get_flips(discs[player], discs[opponent], sq)
+    discs[player] |= flips | (1 << sq)
+    discs[opponent] ^= flips
+    n = flips.bit_count()
+    counts = pos.counts
+    counts[player] += n + 1
+    counts[opponent] -= n
+    pos.turn = opponent
+
+    # Hash y mapa de calor se actualizan en la misma pasada por las volteadas
+    old_hash = pos.hash
+    h = old_hash ^ ZOBRIST[player][sq] ^ ZOBRIST_WHITE_TO_MOVE
+    weights = SQUARE_WEIGHTS
+    flipped_weight = 0
+    f = flips
+    while f:
+        bit = f & -f
+        i = bit.bit_length() - 1
+        h ^= ZOBRIST_FLIP[i]
+        flipped_weight += weights[i]
+        f ^= bit
+    pos.hash = h
+    positional = pos.positional
+    positional[player] += weights[sq] + flipped_weight
+    positional[opponent] -= flipped_weight
+    return sq, flips, old_hash, flipped_weight
+
+
+def unmake_move(pos: Position, undo: tuple[int, int, int, int]) -> None:
+    """Restaura la posición anterior a make_move."""
+    sq, flips, pos.hash, flipped_weight = undo
+    opponent = pos.turn
+    player = 3 - opponent
+    discs = pos.discs
+    discs[player] ^= flips | (1 << sq)
+    discs[opponent] |= flips
+    n = flips.bit_count()
+    counts = pos.counts
+    counts[player] -= n + 1
+    counts[opponent] += n
+    positional = pos.positional
+    positional[player] -= SQUARE_WEIGHTS[sq] + flipped_weight
+    positional[opponent] += flipped_weight
+    pos.turn = player
+
+
+def pass_turn(pos: Position) -> None:
+    """Cede el turno sin jugar (es su propia inversa)."""
+    pos.turn = 3 - pos.turn
+    pos.hash ^= ZOBRIST_WHITE_TO_MOVE
+
+
+def resolve_pass(pos: Position) -> int:
+    """
+    Para cuando ``pos.turn`` ya sabe que no tiene jugadas: cede el turno y
+    devuelve las jugadas del rival. Si también es 0 la partida ha terminado.
+    """
+    pass_turn(pos)
+    return legal_moves(pos)
@@ -114,9 +114,19 @@ class AIHeuristic(str, PyEnum):
     STATIC_WEIGHTS = "static_weights"  # Matriz fija de valores
     MOBILITY_BASED = "mobility_based"  # Prioriza tener muchos movimientos
     HYBRID = "hybrid"  # Mezcla de ambas
+    PATTERN = "pattern"  # Tablas de patrones (bordes, esquinas, diagonales)
+    POTENTIAL_MOBILITY = "potential_mobility"  # Movilidad potencial y frontera
+    HYBRID_FRONTIER = "hybrid_frontier"  # Híbrida + frontera y fichas estables
     NONE = "none"
 
 
+class MeasureLevel(str, PyEnum):
+    # Qué se mide en cada jugada del bot (ver ai.measure.measure_performance)
+    OFF = "off"
+    TIME = "time"  # Tiempo real y de CPU
+    MEMORY = "memory"  # Tiempos y pico de memoria (tracemalloc, mucho más lento)
+
+
 class Turn(str, PyEnum):
     BLACK = "black"
     WHITE = "white"
@@ -212,7 +222,10 @@ class Moves(SQLModel, table=True):
     player: Turn = Field(sa_column=Column(SAEnum(Turn)))
     position: List[Any] | None = Field(default=None, sa_column=Column(JSON))
     execution_time: float | None = Field(default=None)  # Segundos
+    cpu_time: float | None = Field(default=None)  # Segundos de CPU
     memory_used: float | None = Field(default=None)  # MB
+    # Estadísticas de la búsqueda del bot (ver app.ai.stats.SearchStats)
+    search_stats: dict[str, Any] | None = Field(default=None, sa_column=Column(JSON))
 
     game: Game = Relationship(back_populates="moves")
 
@@ -258,6 +271,48 @@ class AlphaBetaParams(BaseModel):
     time_limit_ms: int | None = Field(
         default=1000, description="Tiempo límite por jugada"
     )
+    tt_size_mb: int = Field(
+        default=16,
+        ge=0,
+        le=256,
+        description=(
+            "Memoria de la tabla de transposición en MB (0 la desactiva). El "
+            "servidor la limita a MAX_TT_MB"
+        ),
+    )
+    use_pvs: bool = Field(
+        default=False,
+        description="Búsqueda de variante principal (ventanas nulas)",
+    )
+    aspiration_window: int = Field(
+        default=50,
+        ge=0,
+        description="Semiventana de aspiración con PVS (0 la desactiva)",
+    )
+    endgame_empties: int = Field(
+        default=12,
+        ge=0,
+        le=20,
+        description="Casillas libres para resolver el final exacto (0 lo desactiva)",
+    )
+    parallel_workers: int = Field(
+        default=0,
+        ge=0,
+        le=64,
+        description=(
+            "Procesos para repartir la raíz desde la profundidad 2 (0 o 1 = "
+            "búsqueda en serie). Cada iteración paga el envío de las jugadas a "
+            "los procesos (y la primera vez, arrancarlos): con time_limit_ms "
+            "cortos apenas compensa. El servidor lo limita a "
+            "MAX_SEARCH_WORKERS"
+        ),
+    )
+    ponder: bool = Field(
+        default=False, description="Pensar la respuesta mientras juega el humano"
+    )
+    use_book: bool = Field(
+        default=True, description="Usar el libro de aperturas si está configurado"
+    )
 
 
 class MonteCarloParams(BaseModel):
@@ -268,6 +323,12 @@ class MonteCarloParams(BaseModel):
     time_limit: float = Field(
         default=4.5, ge=0.1, le=120.0, description="Tiempo límite en segundos"
     )
+    ponder: bool = Field(
+        default=False, description="Pensar la respuesta mientras juega el humano"
+    )
+    use_book: bool = Field(
+        default=True, description="Usar el libro de aperturas si está configurado"
+    )
 
 
 class QLearningParams(BaseModel):
@@ -352,8 +413,10 @@ class BotMoveResponse(BaseModel):
     game: GamePublic  # El estado resultante
     move_made: List[int] | None  # La coordenada donde movió (None si pasó turno)
     message: str  # Ej: "AlphaBeta movió a D3 en 1.5s"
-    execution_time: float
-    memory_peak_mb: float
+    execution_time: float | None
+    cpu_time: float | None = None
+    memory_peak_mb: float | None
+    search_stats: dict[str, Any] | None = None
 
 
 class GameStateResult(BaseModel):
@@ -368,6 +431,7 @@ class SimulationRequest(BaseModel):
     num_games: int = Field(default=100, ge=1, le=1000)
     bot_black: AIConfigInput
     bot_white: AIConfigInput
+    measure: MeasureLevel = MeasureLevel.TIME
 
 
 class SimulationResult(BaseModel):
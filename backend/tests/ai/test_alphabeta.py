@@ -0,0 +1,235 @@
+import math
+import random
+import threading
+import time
+
+import pytest
+
+from app import bitboard, logic
+from app.ai import alphabeta
+from app.ai.heuristics import evaluate_end_position, evaluate_position
+from app.ai.stats import SearchStats
+from app.core.config import settings
+from tests.utils.positions import random_position
+
+
+@pytest.fixture
+def two_workers(monkeypatch):
+    """Permite el pool de 2 procesos aunque la máquina tenga una sola CPU."""
+    monkeypatch.setattr(settings, "MAX_SEARCH_WORKERS", 2)
+
+
+@pytest.mark.usefixtures("two_workers")
+def test_parallel_root_matches_serial() -> None:
+    rng = random.Random(11)
+    for _ in range(4):
+        pos = random_position(rng, 16, min_moves=2)
+        board, player = pos.to_board(), pos.turn
+        params = {"depth": 3, "heuristic": "hybrid", "time_limit_ms": None}
+        serial = alphabeta.get_move(board, player, params)
+        parallel = alphabeta.get_move(board, player, {**params, "parallel_workers": 2})
+        assert parallel == serial
+
+
+def test_search_stats_are_filled() -> None:
+    pos = random_position(random.Random(3), 16, min_moves=2)
+    board, player = pos.to_board(), pos.turn
+    stats = SearchStats()
+    params = {"depth": 4, "heuristic": "hybrid", "time_limit_ms": None}
+    alphabeta.get_move(board, player, params, stats=stats)
+    assert stats.source == "search"
+    assert stats.depth_completed == 4
+    assert stats.nodes > stats.leaf_evals > 0
+    assert stats.cutoffs >= stats.first_move_cutoffs > 0
+    assert stats.tt_hits > 0
+    assert stats.eval_cache_hits + stats.eval_cache_misses == stats.leaf_evals
+
+
+def test_time_limit_is_honored() -> None:
+    pos = random_position(random.Random(5), 16, min_moves=2)
+    params = {"depth": 30, "heuristic": "hybrid_frontier", "time_limit_ms": 200}
+    stats = SearchStats()
+    start = time.perf_counter()
+    move = alphabeta.get_move(pos.to_board(), pos.turn, params, stats=stats)
+    assert move is not None
+    # Se corta antes de la profundidad pedida (con 44 libres no llegaría nunca)
+    assert 1 <= stats.depth_completed < 30
+    assert time.perf_counter() - start < 0.2 + 2  # Margen amplio: solo cuelgues
+
+
+def test_ordered_moves_are_a_permutation_of_legal_moves() -> None:
+    rng = random.Random(8)
+    for _ in range(10):
+        pos = random_position(rng, rng.randint(4, 40), min_moves=2)
+        moves = logic.legal_moves(pos)
+        legal = sorted(bitboard.iter_squares(moves))
+        tt_move = rng.choice(legal)
+        discs = pos.discs[:]
+        for use_sorting in (True, False):
+            ctx = alphabeta.SearchContext("hybrid", use_sorting=use_sorting)
+            for depth in (1, alphabeta.MOBILITY_ORDERING_DEPTH):
+                ordered = alphabeta._ordered_moves(pos, moves, tt_move, depth, 0, ctx)
+                assert sorted(ordered) == legal
+                assert ordered[0] == tt_move
+                assert pos.discs == discs
+
+
+def test_killers_and_history_reorder_moves() -> None:
+    pos = random_position(random.Random(4), 20, min_moves=3)
+    moves = logic.legal_moves(pos)
+    legal = sorted(bitboard.iter_squares(moves))
+    first, second, target = legal[:3]
+
+    ctx = alphabeta.SearchContext("hybrid")
+    ctx.record_cutoff(first, 3, 0)
+    ctx.record_cutoff(second, 3, 0)
+    assert ctx.killers[0] == [second, first]
+    assert ctx.history[first] == ctx.history[second] == 9
+    ctx.age_history()
+    assert ctx.history[first] == 4
+
+    ctx.history[target] = 10**6
+    ordered = alphabeta._ordered_moves(pos, moves, alphabeta.NO_MOVE, 1, 0, ctx)
+    assert sorted(ordered) == legal
+    assert ordered[0] == target
+
+
+def _plain_negamax(pos, depth: int, heuristic: str):
+    """Negamax sin podas ni tabla, con los mismos pases que _negamax."""
+    moves = logic.legal_moves(pos)
+    if depth <= 0 or not moves:
+        if not moves:
+            logic.pass_turn(pos)
+            if not logic.legal_moves(pos):
+                logic.pass_turn(pos)
+                return evaluate_end_position(pos, pos.turn)
+            score = -_plain_negamax(pos, depth - 1, heuristic)
+            logic.pass_turn(pos)
+            return score
+        return evaluate_position(pos, pos.turn, heuristic)
+    best = -math.inf
+    for sq in bitboard.iter_squares(moves):
+        undo = logic.make_move(pos, sq)
+        best = max(best, -_plain_negamax(pos, depth - 1, heuristic))
+        logic.unmake_move(pos, undo)
+    return best
+
+
+def test_pvs_and_aspiration_match_plain_negamax() -> None:
+    depth = 3
+    rng = random.Random(6)
+    for _ in range(3):
+        pos = random_position(rng, rng.randint(10, 30), min_moves=2)
+        expected = _plain_negamax(pos, depth, "hybrid")
+        for use_pvs in (False, True):
+            ctx = alphabeta.SearchContext("hybrid", use_pvs=use_pvs)
+            assert alphabeta._search_root(pos, depth, ctx)[1] == expected
+            # Ventana que contiene el valor: el resultado sigue siendo exacto
+            _, score = alphabeta._search_root(
+                pos, depth, ctx, alphabeta.NO_MOVE, expected - 5, expected + 5
+            )
+            assert score == expected
+
+            for window in (0, 10):
+                params = {
+                    "depth": depth,
+                    "heuristic": "hybrid",
+                    "time_limit_ms": None,
+                    "endgame_empties": 0,
+                    "use_pvs": use_pvs,
+                    "aspiration_window": window,
+                }
+                row, col = alphabeta.get_move(pos.to_board(), pos.turn, params)
+                undo = logic.make_move(pos, bitboard.square(row, col))
+                assert -_plain_negamax(pos, depth - 1, "hybrid") == expected
+                logic.unmake_move(pos, undo)
+
+
+def test_replaced_pool_stays_usable_until_released() -> None:
+    old, old_slot, _ = alphabeta._acquire_slot(2)
+    new, new_slot, _ = alphabeta._acquire_slot(3)
+    try:
+        assert new is not old
+        assert old.submit(abs, -1).result() == 1
+    finally:
+        alphabeta._release_slot(new, new_slot)
+        alphabeta._release_slot(old, old_slot)
+    with pytest.raises(RuntimeError):
+        old.submit(abs, -1)
+
+
+@pytest.mark.usefixtures("two_workers")
+def test_broken_pool_falls_back_to_serial() -> None:
+    pos = random_position(random.Random(2), 16, min_moves=2)
+    params = {"depth": 3, "heuristic": "hybrid", "time_limit_ms": None}
+    serial = alphabeta.get_move(pos.to_board(), pos.turn, params)
+    pool, slot, _ = alphabeta._acquire_slot(2)
+    alphabeta._release_slot(pool, slot)
+    pool.shutdown()
+    parallel = alphabeta.get_move(
+        pos.to_board(), pos.turn, {**params, "parallel_workers": 2}
+    )
+    assert parallel == serial
+
+
+@pytest.mark.usefixtures("two_workers")
+def test_parallel_search_stops_on_event() -> None:
+    # Pool ya arrancado: que la prueba no dependa de lo que tarda "spawn"
+    pool, slot, _ = alphabeta._acquire_slot(2)
+    pool.submit(abs, -1).result()
+    alphabeta._release_slot(pool, slot)
+
+    pos = random_position(random.Random(2), 16, min_moves=2)
+    params = {
+        "depth": 30,
+        "heuristic": "hybrid",
+        "time_limit_ms": None,
+        "parallel_workers": 2,
+    }
+    stop = threading.Event()
+    stats = SearchStats()
+    result = []
+    search = threading.Thread(
+        target=lambda: result.append(
+            alphabeta.get_move(pos.to_board(), pos.turn, params, stop=stop, stats=stats)
+        )
+    )
+    search.start()
+    time.sleep(0.3)
+    assert search.is_alive()  # Sin límite de tiempo: solo para con stop
+    stop.set()
+    search.join(timeout=10)
+    assert not search.is_alive()
+    assert result[0] is not None and stats.depth_completed < 30
+
+
+def test_parallel_workers_are_capped(monkeypatch) -> None:
+    pos = random_position(random.Random(3), 16, min_moves=2)
+    params = {"depth": 3, "heuristic": "hybrid", "time_limit_ms": None}
+    serial = alphabeta.get_move(pos.to_board(), pos.turn, params)
+    requested = []
+    acquire = alphabeta._acquire_slot
+
+    def spy(workers):
+        requested.append(workers)
+        return acquire(workers)
+
+    monkeypatch.setattr(alphabeta, "_acquire_slot", spy)
+    monkeypatch.setattr(settings, "MAX_SEARCH_WORKERS", 1)
+    params["parallel_workers"] = 64
+    assert alphabeta.get_move(pos.to_board(), pos.turn, params) == serial
+    assert requested == []  # Con 1 proceso máximo ni se usa el pool
+
+    monkeypatch.setattr(settings, "MAX_SEARCH_WORKERS", 2)
+    assert alphabeta.get_move(pos.to_board(), pos.turn, params) == serial
+    assert requested and set(requested) == {2}
+
+
+def test_tt_size_is_capped(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "MAX_TT_MB", 1)
+    state = alphabeta.SearchState()
+    pos = random_position(random.Random(4), 10, min_moves=2)
+    params = {"depth": 2, "heuristic": "hybrid", "tt_size_mb": 256}
+    alphabeta.get_move(pos.to_board(), pos.turn, params, state)
+    assert state.key == ("hybrid", 1)
+    assert state.nbytes() <= 1024 * 1024 + state.evals.nbytes()
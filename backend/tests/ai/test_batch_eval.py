@@ -0,0 +1,22 @@
+import random
+
+import numpy as np
+
+from app.ai.batch_eval import evaluate_batch, to_bitboards
+from app.ai.heuristics import evaluate_position
+from tests.utils.positions import random_position
+
+
+def test_batch_matches_single_evaluation() -> None:
+    rng = random.Random(9)
+    positions = [random_position(rng, rng.randint(0, 50)) for _ in range(60)]
+    boards = np.array([pos.to_board() for pos in positions], dtype=np.int8)
+    pairs = np.array([pos.discs[1:] for pos in positions], dtype=np.uint64)
+    players = np.array([pos.turn for pos in positions])
+    assert (to_bitboards(boards) == pairs).all()
+
+    for heuristic in ("static_weights", "mobility_based", "hybrid", "pattern"):
+        expected = [evaluate_position(pos, pos.turn, heuristic) for pos in positions]
+        assert evaluate_batch(boards, players, heuristic).tolist() == expected
+        expected = [evaluate_position(pos, 2, heuristic) for pos in positions]
+        assert evaluate_batch(pairs, 2, heuristic).tolist() == expected
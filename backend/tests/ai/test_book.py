@@ -0,0 +1,80 @@
+import random
+
+from app import bitboard, logic
+from app.ai import book
+from app.core.config import settings
+from app.utils import get_initial_board
+
+
+def test_symmetries_commute_with_move_generation() -> None:
+    rng = random.Random(2)
+    for _ in range(20):
+        occupied = rng.getrandbits(64)
+        me = occupied & rng.getrandbits(64)
+        opp = occupied & ~me
+        moves = bitboard.get_moves(me, opp)
+        for t in range(8):
+            assert bitboard.get_moves(
+                bitboard.transform(me, t), bitboard.transform(opp, t)
+            ) == bitboard.transform(moves, t)
+
+
+def test_book_round_trip(tmp_path) -> None:
+    builder = book.BookBuilder(max_plies=4)
+    builder.add_game([(2, 3), (2, 2), (2, 1), (1, 1)], "black")
+    builder.add_game([(2, 3), (4, 2), (5, 3)], "white")  # Blancas ganan con (4, 2)
+    path = tmp_path / "book.bin"
+    book.write_book(path, builder.records())
+
+    opening = book.OpeningBook(path)
+    try:
+        assert len(opening) == 5  # Posiciones distintas de ambas partidas
+        after = logic.apply_move(get_initial_board(), 2, 3, 1).board_state
+        assert opening.lookup(after, 2) == (4, 2)
+
+        # La misma posición girada 180 grados: la jugada del libro también gira
+        rotated = [row[::-1] for row in after[::-1]]
+        assert opening.lookup(rotated, 2) == (3, 5)
+        # Blancas con la posición inicial es la inicial de negras girada
+        assert opening.lookup(get_initial_board(), 2) == (2, 4)
+        assert opening.lookup(after, 1) is None
+    finally:
+        opening.close()
+
+
+def test_book_is_opened_once_it_exists(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "book.bin"
+    monkeypatch.setattr(settings, "OPENING_BOOK_PATH", str(path))
+    assert book.get_book() is None
+
+    builder = book.BookBuilder(max_plies=2)
+    builder.add_game([(2, 3), (2, 2)], "black")
+    book.write_book(path, builder.records())
+    opening = book.get_book()
+    assert opening is not None and opening.max_plies == 1
+    assert book.get_book() is opening
+
+    # Más allá de la última jugada del libro ni se busca
+    board = get_initial_board()
+    for row, col, player in ((2, 3, 1), (2, 2, 2), (2, 1, 1)):
+        board = logic.apply_move(board, row, col, player).board_state
+    assert opening.lookup(board, 2) is None
+
+
+def test_unreadable_book_falls_back_to_search(tmp_path, monkeypatch, caplog) -> None:
+    builder = book.BookBuilder(max_plies=2)
+    builder.add_game([(2, 3), (2, 2)], "black")
+    path = tmp_path / "book.bin"
+    book.write_book(path, builder.records())
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) - 4])  # Cortado a medias
+    monkeypatch.setattr(settings, "OPENING_BOOK_PATH", str(path))
+
+    assert book.get_book() is None
+    assert book.lookup(get_initial_board(), 1) is None
+    assert len(caplog.records) == 1  # Se avisa una sola vez
+    assert "book.bin" in caplog.records[0].getMessage()
+
+    # Un directorio tampoco rompe las jugadas
+    monkeypatch.setattr(settings, "OPENING_BOOK_PATH", str(tmp_path))
+    assert book.get_book() is None
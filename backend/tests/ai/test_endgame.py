@@ -0,0 +1,72 @@
+import random
+import time
+
+from app import bitboard, logic
+from app.ai import alphabeta, endgame
+from app.ai.stats import SearchStats
+from tests.utils.positions import random_position
+
+
+def _minimax(me: int, opp: int, passed: bool = False) -> int:
+    """Búsqueda completa sin podas para comparar con el solver."""
+    moves = bitboard.get_moves(me, opp)
+    if not moves:
+        if passed:
+            return me.bit_count() - opp.bit_count()
+        return -_minimax(opp, me, True)
+    best = -64
+    for sq in bitboard.iter_squares(moves):
+        flips = bitboard.get_flips(me, opp, sq)
+        best = max(best, -_minimax(opp ^ flips, me | flips | (1 << sq)))
+    return best
+
+
+def test_solver_matches_full_search() -> None:
+    rng = random.Random(7)
+    for _ in range(10):
+        pos = random_position(rng, 52, min_moves=1)
+        me, opp = pos.discs[pos.turn], pos.discs[3 - pos.turn]
+        result = endgame.solve(pos)
+        assert result.margin == _minimax(me, opp)
+        flips = bitboard.get_flips(me, opp, result.move)
+        assert -_minimax(opp ^ flips, me | flips | (1 << result.move)) == result.margin
+
+
+def test_solver_outcome() -> None:
+    # Última fila blanca y una casilla libre en la que nadie puede jugar
+    board = [[1] * 8 for _ in range(8)]
+    board[7] = [2] * 7 + [0]
+    result = endgame.solve(logic.Position.from_board(board, 1))
+    assert result == (endgame.NO_MOVE, 49, "win")
+    result = endgame.solve(logic.Position.from_board(board, 2))
+    assert result == (endgame.NO_MOVE, -49, "loss")
+
+
+def test_alphabeta_uses_solver() -> None:
+    pos = random_position(random.Random(3), 52, min_moves=1)
+    expected = endgame.solve(pos)
+    move = alphabeta.get_move(pos.to_board(), pos.turn, {"depth": 1})
+    me, opp = pos.discs[pos.turn], pos.discs[3 - pos.turn]
+    sq = bitboard.square(*move)
+    flips = bitboard.get_flips(me, opp, sq)
+    assert -_minimax(opp ^ flips, me | flips | (1 << sq)) == expected.margin
+
+
+def test_solver_timeout_keeps_time_limit() -> None:
+    # 16 casillas libres: el final no termina en 100 ms
+    pos = random_position(random.Random(1), 44, min_moves=2)
+    params = {
+        "depth": 12,
+        "heuristic": "hybrid_frontier",
+        "time_limit_ms": 100,
+        "endgame_empties": 16,
+    }
+    assert endgame.solve(pos, time.perf_counter() + 0.1) is None
+
+    # get_move no se pasa del límite: tras el solver solo hace la profundidad 1
+    stats = SearchStats()
+    start = time.perf_counter()
+    move = alphabeta.get_move(pos.to_board(), pos.turn, params, stats=stats)
+    assert move in logic.get_valid_moves(pos.to_board(), pos.turn)
+    assert stats.source == "search" and stats.depth_completed == 1
+    assert time.perf_counter() - start < 2  # Margen amplio: solo contra cuelgues
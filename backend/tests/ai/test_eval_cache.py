@@ -0,0 +1,25 @@
+from app import logic
+from app.ai.eval_cache import EvalCache
+from app.ai.heuristics import evaluate_position
+from app.utils import get_initial_board
+
+
+def test_cached_values_match_heuristic() -> None:
+    cache = EvalCache(1)
+    pos = logic.Position.from_board(get_initial_board(), 1)
+    logic.make_move(pos, 19)
+    for heuristic in ("static_weights", "mobility_based", "hybrid_frontier"):
+        for player in (1, 2):
+            expected = evaluate_position(pos, player, heuristic)
+            assert cache.evaluate(pos, player, heuristic) == expected
+            assert cache.evaluate(pos, player, heuristic) == expected
+    assert (cache.hits, cache.misses) == (6, 6)
+
+    cache.new_search()
+    assert (cache.hits, cache.misses) == (0, 0)
+    cache.evaluate(pos, 1, "hybrid_frontier")
+    assert cache.hits == 1
+
+    cache.clear()
+    cache.evaluate(pos, 1, "hybrid_frontier")
+    assert (cache.hits, cache.misses) == (0, 1)
@@ -0,0 +1,44 @@
+import threading
+import time
+
+from app.ai.measure import measure_performance, search_lock
+from app.models import MeasureLevel
+
+
+@measure_performance
+def _allocate(n):
+    return len([0] * n)
+
+
+def test_measure_levels() -> None:
+    result, perf = _allocate(1000, measure=MeasureLevel.OFF)
+    assert result == 1000
+    assert perf.execution_time is None and perf.cpu_time is None
+    assert perf.memory_mb is None
+
+    _, perf = _allocate(1000, measure=MeasureLevel.TIME)
+    assert perf.execution_time >= 0 and perf.cpu_time >= 0
+    assert perf.memory_mb is None
+
+    # 1M punteros son unos 8 MB
+    _, perf = _allocate(1_000_000, measure=MeasureLevel.MEMORY)
+    assert perf.execution_time >= 0 and perf.memory_mb > 7
+
+
+def test_memory_measurement_waits_for_other_searches() -> None:
+    events = []
+    started = threading.Event()
+
+    def search():
+        with search_lock.shared():
+            started.set()
+            time.sleep(0.1)
+            events.append("search")
+
+    thread = threading.Thread(target=search)
+    thread.start()
+    started.wait()
+    _allocate(10, measure=MeasureLevel.MEMORY)
+    events.append("measure")
+    thread.join()
+    assert events == ["search", "measure"]
@@ -0,0 +1,37 @@
+import random
+
+from app.ai import book, patterns
+from app.ai.heuristics import PATTERN_TABLES
+
+
+def _slow_evaluate(me: int, opp: int) -> int:
+    """Índices calculados casilla a casilla sobre cada imagen del patrón."""
+    discs = me.bit_count() + opp.bit_count()
+    phase = patterns.PHASE_BY_DISCS[discs]
+    score = patterns.DISC_VALUE[phase] * (me.bit_count() - opp.bit_count())
+    for name, squares in patterns.PATTERNS.items():
+        table = PATTERN_TABLES.arrays[name][phase]
+        seen = set()
+        for t in range(8):
+            image = [book.SYMMETRY_SQUARES[t][sq] for sq in squares]
+            if frozenset(image) in seen:
+                continue
+            seen.add(frozenset(image))
+            index = 0
+            for digit, sq in enumerate(image):
+                if me >> sq & 1:
+                    index += 3**digit
+                elif opp >> sq & 1:
+                    index += 2 * 3**digit
+            score += int(table[index])
+    return score
+
+
+def test_pattern_indexes_match_slow_version() -> None:
+    rng = random.Random(5)
+    for _ in range(200):
+        occupied = rng.getrandbits(64)
+        me = occupied & rng.getrandbits(64)
+        opp = occupied & ~me
+        assert PATTERN_TABLES.evaluate(me, opp) == _slow_evaluate(me, opp)
+        assert PATTERN_TABLES.evaluate(opp, me) == -_slow_evaluate(me, opp)
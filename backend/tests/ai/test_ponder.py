@@ -0,0 +1,115 @@
+import threading
+import time
+import uuid
+
+from app import ai, logic
+from app.ai import alphabeta, book, ponder
+from app.ai.stats import SearchStats
+from app.models import AIAlgorithm
+from app.utils import get_initial_board
+
+
+def test_pondered_reply_is_served_from_cache() -> None:
+    game_id = uuid.uuid4()
+    board = get_initial_board()
+    params = {"depth": 2, "heuristic": "static_weights", "time_limit_ms": None}
+    ponder.start(game_id, alphabeta, board, 1, params)
+    ponder._jobs[game_id].thread.join(timeout=30)
+
+    after = logic.apply_move(board, 2, 3, 1).board_state
+    expected = alphabeta.get_move(after, 2, params)
+    assert ponder.take_move(game_id, after, 2, params) == expected
+    # Cada respuesta se sirve una vez y el pondering de la partida se detiene
+    assert ponder.take_move(game_id, after, 2, params) is None
+    assert game_id not in ponder._jobs
+
+
+def test_cancel_stops_pondering() -> None:
+    game_id = uuid.uuid4()
+    params = {"depth": 8, "heuristic": "hybrid", "time_limit_ms": None}
+    ponder.start(game_id, alphabeta, get_initial_board(), 1, params)
+    job = ponder._jobs[game_id]
+    ponder.cancel(game_id)
+    job.thread.join(timeout=10)
+    assert not job.thread.is_alive()
+
+
+def test_book_move_stops_pondering(monkeypatch) -> None:
+    game_id = uuid.uuid4()
+    params = {"depth": 8, "heuristic": "hybrid", "time_limit_ms": None}
+    board = get_initial_board()
+    ponder.start(game_id, alphabeta, board, 1, params)
+    job = ponder._jobs[game_id]
+
+    after = logic.apply_move(board, 2, 3, 1).board_state
+    monkeypatch.setattr(book, "lookup", lambda board, player: (2, 2))
+    stats = SearchStats()
+    move, _ = ai.select_best_move(
+        after, 2, AIAlgorithm.ALPHABETA, params, game_id, stats
+    )
+    assert move == (2, 2) and stats.source == "book"
+    # Aunque la jugada salga del libro, el pondering de la partida se detiene
+    job.thread.join(timeout=10)
+    assert not job.thread.is_alive()
+    assert game_id not in ponder._jobs
+
+
+class _BlockingEngine:
+    """Motor falso: la primera búsqueda espera a ``release``; las demás, a stop."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.boards = []
+
+    def get_move(self, board, player, parameters, stop=None, stats=None):
+        self.boards.append(board)
+        if len(self.boards) == 1:
+            self.started.set()
+            self.release.wait(10)
+            return (0, 0)
+        stop.wait(10)  # Sin límite de tiempo hasta que la paren
+        return None
+
+
+def test_take_move_waits_only_for_its_own_position() -> None:
+    game_id = uuid.uuid4()
+    params = {"use_book": False}
+    engine = _BlockingEngine()
+    ponder.start(game_id, engine, get_initial_board(), 1, params)
+    job = ponder._jobs[game_id]
+    assert engine.started.wait(10)
+    board = engine.boards[0]
+
+    result = []
+    taker = threading.Thread(
+        target=lambda: result.append(ponder.take_move(game_id, board, 2, params))
+    )
+    taker.start()
+    time.sleep(0.05)
+    # La búsqueda pedida acaba justo cuando el hilo pasaría a la siguiente
+    engine.release.set()
+    taker.join(timeout=5)
+    assert not taker.is_alive() and result == [(0, 0)]
+    job.thread.join(timeout=5)
+    assert not job.thread.is_alive()
+    assert len(engine.boards) == 1  # No empezó ninguna otra posición
+
+
+def test_take_move_after_thread_moved_on() -> None:
+    game_id = uuid.uuid4()
+    params = {"use_book": False}
+    engine = _BlockingEngine()
+    engine.release.set()
+    ponder.start(game_id, engine, get_initial_board(), 1, params)
+    job = ponder._jobs[game_id]
+    deadline = time.monotonic() + 10
+    while len(engine.boards) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(engine.boards) == 2  # Ya está con la siguiente, sin límite
+
+    start = time.monotonic()
+    assert ponder.take_move(game_id, engine.boards[0], 2, params) == (0, 0)
+    assert time.monotonic() - start < 5  # No espera a la búsqueda ajena
+    job.thread.join(timeout=5)
+    assert not job.thread.is_alive()
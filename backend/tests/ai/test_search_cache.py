@@ -0,0 +1,47 @@
+import random
+
+from app import logic
+from app.ai import montecarlo
+from app.ai.search_cache import SearchStateCache
+from app.utils import get_initial_board
+
+
+class _State:
+    def __init__(self, size: int) -> None:
+        self.size = size
+
+    def nbytes(self) -> int:
+        return self.size
+
+
+def test_lru_eviction_respects_memory_cap() -> None:
+    cache = SearchStateCache(max_bytes=100)
+    cache.put(("a", 1), _State(40))
+    cache.put(("b", 1), _State(40))
+    assert cache.take(("a", 1)).size == 40  # "a" pasa a ser la más reciente
+    cache.put(("a", 1), _State(40))
+    cache.put(("c", 1), _State(40))  # No cabe: sale "b"
+    assert cache.take(("b", 1)) is None
+    assert cache.total_bytes == 80
+    cache.put(("d", 1), _State(500))  # Más grande que el límite: no se guarda
+    assert cache.take(("d", 1)) is None
+    cache.discard_game("a")
+    assert len(cache) == 1
+
+
+def test_montecarlo_reuses_subtree() -> None:
+    random.seed(5)
+    board = get_initial_board()
+    state = montecarlo.SearchState()
+    params = {"iterations": 300, "time_limit": 60}
+    row, col = montecarlo.get_move(board, 1, params, state)
+    board = logic.apply_move(board, row, col, 1).board_state
+    reply = logic.get_valid_moves(board, 2)[0]
+    board = logic.apply_move(board, reply[0], reply[1], 2).board_state
+
+    warm = state.subtree(logic.Position.from_board(board, 1))
+    assert warm is not None
+    visits = warm.visits
+    montecarlo.get_move(board, 1, params, state)
+    assert state.root is warm
+    assert warm.visits == visits + 300
@@ -0,0 +1,48 @@
+import random
+
+from app import bitboard
+from app.ai.stability import EDGE_STABLE, stable_discs
+from tests.utils.positions import random_position
+
+
+def _never_flipped(me: int, opp: int, mine: int, theirs: int) -> bool:
+    """Recorre todas las continuaciones comprobando que ``mine`` sigue en ``me``."""
+    if me & mine != mine or opp & theirs != theirs:
+        return False
+    moves = bitboard.get_moves(me, opp)
+    if not moves:
+        if bitboard.get_moves(opp, me):
+            return _never_flipped(opp, me, theirs, mine)
+        return True
+    for sq in bitboard.iter_squares(moves):
+        flips = bitboard.get_flips(me, opp, sq)
+        if not _never_flipped(opp ^ flips, me | flips | (1 << sq), theirs, mine):
+            return False
+    return True
+
+
+def test_edge_table() -> None:
+    # Fichas seguidas desde la esquina: estables; la suelta no
+    assert EDGE_STABLE[0b00100111 << 8] == 0b00000111
+    # Borde lleno: todo estable
+    assert EDGE_STABLE[0b11110000 << 8 | 0b00001111] == 0b11110000
+    # Sin esquina se puede voltear
+    assert EDGE_STABLE[0b00111100 << 8] == 0
+
+
+def test_full_board_is_stable() -> None:
+    rng = random.Random(2)
+    me = rng.getrandbits(64)
+    assert stable_discs(me, bitboard.FULL ^ me) == me
+
+
+def test_stable_discs_are_never_flipped() -> None:
+    rng = random.Random(3)
+    found = 0
+    for _ in range(20):
+        pos = random_position(rng, 53)
+        me, opp = pos.discs[pos.turn], pos.discs[3 - pos.turn]
+        mine, theirs = stable_discs(me, opp), stable_discs(opp, me)
+        found += mine.bit_count() + theirs.bit_count()
+        assert _never_flipped(me, opp, mine, theirs)
+    assert found
@@ -0,0 +1,32 @@
+import random
+
+from app.ai import alphabeta, montecarlo
+from app.ai.stats import SearchStats
+from tests.utils.positions import random_position
+
+
+def test_derived_rates() -> None:
+    stats = SearchStats(nodes=2000, cutoffs=500, search_time=0.5)
+    assert stats.nps == 4000
+    assert stats.cutoff_rate == 0.25
+    data = stats.as_dict()
+    assert data["nps"] == 4000 and data["cutoff_rate"] == 0.25
+
+    # Sin nodos ni tiempo (libro, jugada única...) no se divide por cero
+    assert SearchStats().nps == 0 and SearchStats().cutoff_rate == 0
+    # Monte Carlo no cuenta nodos: las iteraciones hacen de nodos
+    assert SearchStats(iterations=300, search_time=1.5).nps == 200
+
+
+def test_engines_measure_search_time() -> None:
+    pos = random_position(random.Random(6), 16, min_moves=2)
+    stats = SearchStats()
+    params = {"depth": 3, "heuristic": "hybrid", "time_limit_ms": None}
+    alphabeta.get_move(pos.to_board(), pos.turn, params, stats=stats)
+    assert stats.search_time > 0 and stats.nps > 0
+    assert 0 < stats.cutoff_rate < 1
+
+    stats = SearchStats()
+    params = {"iterations": 50, "heuristic": "none", "time_limit": 5}
+    montecarlo.get_move(pos.to_board(), pos.turn, params, stats=stats)
+    assert stats.search_time > 0 and stats.nps > 0
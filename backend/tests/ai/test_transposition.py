@@ -0,0 +1,89 @@
+import os
+
+from app.ai.transposition import (
+    EXACT,
+    LOWER,
+    NO_MOVE,
+    UPPER,
+    SharedTranspositionTable,
+    TranspositionTable,
+)
+
+
+def test_store_and_probe() -> None:
+    tt = TranspositionTable(1)
+    key = 0x123456789ABCDEF0
+    tt.store(key, 5, -37, LOWER, 19)
+    assert tt.probe(key) == (5, -37, LOWER, 19)
+    assert tt.probe(key ^ 1 << 63) is None
+
+    # La misma posición siempre se actualiza, aunque llegue con menos profundidad
+    tt.store(key, 2, 40, UPPER, NO_MOVE)
+    assert tt.probe(key) == (2, 40, UPPER, NO_MOVE)
+
+
+def test_replacement_keeps_deeper_entry_of_same_search() -> None:
+    tt = TranspositionTable(1)
+    deep = 0x0F0F0F0F00000001
+    other = deep + (tt.mask + 1)  # Misma entrada, otra posición
+    tt.store(deep, 6, 10, EXACT, 3)
+
+    tt.store(other, 4, -5, LOWER, 7)
+    assert tt.probe(deep) == (6, 10, EXACT, 3)
+    assert tt.probe(other) is None
+
+    tt.store(other, 6, -5, LOWER, 7)
+    assert tt.probe(other) == (6, -5, LOWER, 7)
+    assert tt.probe(deep) is None
+
+
+def test_replacement_prefers_new_search() -> None:
+    tt = TranspositionTable(1)
+    old = 0x0F0F0F0F00000001
+    new = old + (tt.mask + 1)
+    tt.store(old, 8, 10, EXACT, 3)
+    tt.new_search()
+    tt.store(new, 1, 0, UPPER, NO_MOVE)
+    assert tt.probe(new) == (1, 0, UPPER, NO_MOVE)
+    assert tt.probe(old) is None
+
+
+def test_shared_table_is_seen_by_other_handles() -> None:
+    name = f"reversi_tt_test_{os.getpid()}"
+    owner = SharedTranspositionTable(name, 1)
+    other = SharedTranspositionTable(name, 4)  # Se adapta al tamaño existente
+    try:
+        assert owner.owner and not other.owner
+        assert other.mask == owner.mask
+        key = 0xFEDCBA9876543210
+        owner.store(key, 3, 12, EXACT, 40)
+        assert other.probe(key) == (3, 12, EXACT, 40)
+
+        # Una escritura a medias (clave de una entrada, datos de otra) se ignora
+        i = key & other.mask
+        other.data[i] ^= 1 << 40
+        assert owner.probe(key) is None
+    finally:
+        other.close()
+        owner.unlink()
+
+
+def test_shared_table_outlives_its_handles() -> None:
+    name = f"reversi_tt_test_{os.getpid()}_keep"
+    key = 0xFEDCBA9876543210
+    first = SharedTranspositionTable(name, 1, version=7)
+    try:
+        first.store(key, 3, 12, EXACT, 40)
+        first.close()
+
+        # Cerrar no borra el bloque: otro proceso sigue viendo las entradas
+        first = SharedTranspositionTable(name, 1, version=7)
+        assert not first.owner
+        assert first.probe(key) == (3, 12, EXACT, 40)
+        first.close()
+
+        # Con otra versión del código de evaluación se vacía
+        first = SharedTranspositionTable(name, 1, version=8)
+        assert first.probe(key) is None
+    finally:
+        first.unlink()
@@ -0,0 +1,118 @@
+from app import bitboard, logic
+from app.utils import get_initial_board
+
+
+def test_initial_valid_moves() -> None:
+    board = get_initial_board()
+    assert logic.get_valid_moves(board, 1) == [(2, 3), (3, 2), (4, 5), (5, 4)]
+    assert logic.get_valid_moves(board, 2) == [(2, 4), (3, 5), (4, 2), (5, 3)]
+
+
+def test_board_round_trip() -> None:
+    board = get_initial_board()
+    board[0][7] = 1
+    board[7][0] = 2
+    black, white = bitboard.from_board(board)
+    assert bitboard.to_board(black, white) == board
+
+
+def test_validate_move() -> None:
+    board = get_initial_board()
+    assert logic.validate_move(board, 2, 3, 1)
+    assert not logic.validate_move(board, 3, 3, 1)  # Casilla ocupada
+    assert not logic.validate_move(board, 0, 0, 1)  # No encierra nada
+
+
+def test_no_wrap_around_edges() -> None:
+    board = [[0] * 8 for _ in range(8)]
+    # Negra al final de la fila 0 y blanca al inicio de la fila 1:
+    # no forman línea aunque sus bits sean consecutivos.
+    board[0][6] = 1
+    board[1][0] = 2
+    board[1][1] = 1
+    assert logic.get_valid_moves(board, 1) == []
+
+
+def test_apply_move_flips_and_scores() -> None:
+    result = logic.apply_move(get_initial_board(), 2, 3, 1)
+    assert result.board_state[2][3] == 1
+    assert result.board_state[3][3] == 1
+    assert result.score_black == 4
+    assert result.score_white == 1
+    assert result.current_turn == 2
+    assert result.winner is None
+
+
+def test_apply_move_game_over() -> None:
+    board = [[0] * 8 for _ in range(8)]
+    board[0][0] = 1
+    board[0][1] = 2
+    result = logic.apply_move(board, 0, 2, 1)
+    assert result.score_black == 3
+    assert result.score_white == 0
+    assert result.current_turn is None
+    assert result.winner == "black"
+
+
+def test_make_unmake_restores_position() -> None:
+    board = get_initial_board()
+    pos = logic.Position.from_board(board, 1)
+    undo = logic.make_move(pos, bitboard.square(2, 3))
+    assert pos.turn == 2
+    assert pos.to_board() == logic.apply_move(board, 2, 3, 1).board_state
+    assert pos.counts[1:] == [4, 1]
+    logic.unmake_move(pos, undo)
+    assert pos.turn == 1
+    assert pos.to_board() == board
+    assert pos.counts[1:] == [2, 2]
+
+
+def test_apply_move_without_turn_resolution() -> None:
+    board = [[0] * 8 for _ in range(8)]
+    board[0][0] = 1
+    board[0][1] = 2
+    result = logic.apply_move(board, 0, 2, 1, resolve_turn=False)
+    assert result.current_turn == 2
+    assert result.winner is None
+    assert logic.game_status(result.board_state, 2) == (None, "black")
+    assert logic.game_status(get_initial_board(), 1) == (1, None)
+
+
+def test_zobrist_hash_is_incremental() -> None:
+    pos = logic.Position.from_board(get_initial_board(), 1)
+    start = pos.hash
+    undos = []
+    for sq in (bitboard.square(2, 3), bitboard.square(2, 2), bitboard.square(3, 2)):
+        undos.append(logic.make_move(pos, sq))
+        assert pos.hash == logic.zobrist_hash(pos.discs[1], pos.discs[2], pos.turn)
+    logic.pass_turn(pos)
+    assert pos.hash == logic.zobrist_hash(pos.discs[1], pos.discs[2], pos.turn)
+    logic.pass_turn(pos)
+    for undo in reversed(undos):
+        logic.unmake_move(pos, undo)
+    assert pos.hash == start
+    # El turno forma parte del hash
+    assert start != logic.Position.from_board(get_initial_board(), 2).hash
+
+
+def test_positional_score_is_incremental() -> None:
+    pos = logic.Position.from_board(get_initial_board(), 1)
+    start = pos.positional[:]
+    undos = []
+    for sq in (bitboard.square(2, 3), bitboard.square(2, 2), bitboard.square(3, 2)):
+        undos.append(logic.make_move(pos, sq))
+        for player in (1, 2):
+            expected = logic.positional_score(pos.discs[player])
+            assert pos.positional[player] == expected
+    for undo in reversed(undos):
+        logic.unmake_move(pos, undo)
+    assert pos.positional == start
+
+
+def test_neighbours_do_not_wrap() -> None:
+    corner = 1 << bitboard.square(0, 7)
+    expected = {(0, 6), (1, 6), (1, 7)}
+    assert set(bitboard.to_coord_list(bitboard.neighbours(corner))) == expected
+    edge = 1 << bitboard.square(4, 0)
+    expected = {(3, 0), (3, 1), (4, 1), (5, 0), (5, 1)}
+    assert set(bitboard.to_coord_list(bitboard.neighbours(edge))) == expected
@@ -0,0 +1,24 @@
+import random
+
+from app import bitboard, logic
+from app.utils import get_initial_board
+
+
+def random_position(
+    rng: random.Random, plies: int, min_moves: int = 0
+) -> logic.Position:
+    """
+    Posición tras ``plies`` jugadas al azar desde la inicial (quedan 60 - plies
+    casillas libres). Si la partida acaba antes, o al que le toca tiene menos
+    de ``min_moves`` jugadas, se vuelve a empezar.
+    """
+    while True:
+        pos = logic.Position.from_board(get_initial_board(), 1)
+        for _ in range(plies):
+            moves = logic.legal_moves(pos) or logic.resolve_pass(pos)
+            if not moves:
+                break
+            logic.make_move(pos, rng.choice(list(bitboard.iter_squares(moves))))
+        else:
+            if logic.legal_moves(pos).bit_count() >= min_moves:
+                return pos
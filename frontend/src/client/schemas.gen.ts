@@ -33,7 +33,7 @@ export const AIConfigSchema = {
 
 export const AIHeuristicSchema = {
     type: 'string',
-    enum: ['static_weights', 'mobility_based', 'hybrid', 'none'],
+    enum: ['static_weights', 'mobility_based', 'hybrid', 'pattern', 'potential_mobility', 'hybrid_frontier', 'none'],
     title: 'AIHeuristic'
 } as const;
 
@@ -64,6 +64,55 @@ export const AlphaBetaParamsSchema = {
             title: 'Time Limit Ms',
             description: 'Tiempo límite por jugada',
             default: 1000
+        },
+        tt_size_mb: {
+            type: 'integer',
+            maximum: 256,
+            minimum: 0,
+            title: 'Tt Size Mb',
+            description: 'Memoria de la tabla de transposición en MB (0 la desactiva). El servidor la limita a MAX_TT_MB',
+            default: 16
+        },
+        use_pvs: {
+            type: 'boolean',
+            title: 'Use Pvs',
+            description: 'Búsqueda de variante principal (ventanas nulas)',
+            default: false
+        },
+        aspiration_window: {
+            type: 'integer',
+            minimum: 0,
+            title: 'Aspiration Window',
+            description: 'Semiventana de aspiración con PVS (0 la desactiva)',
+            default: 50
+        },
+        endgame_empties: {
+            type: 'integer',
+            maximum: 20,
+            minimum: 0,
+            title: 'Endgame Empties',
+            description: 'Casillas libres para resolver el final exacto (0 lo desactiva)',
+            default: 12
+        },
+        parallel_workers: {
+            type: 'integer',
+            maximum: 64,
+            minimum: 0,
+            title: 'Parallel Workers',
+            description: 'Procesos para repartir la raíz desde la profundidad 2 (0 o 1 = búsqueda en serie). Cada iteración paga el envío de las jugadas a los procesos (y la primera vez, arrancarlos): con time_limit_ms cortos apenas compensa. El servidor lo limita a MAX_SEARCH_WORKERS',
+            default: 0
+        },
+        ponder: {
+            type: 'boolean',
+            title: 'Ponder',
+            description: 'Pensar la respuesta mientras juega el humano',
+            default: false
+        },
+        use_book: {
+            type: 'boolean',
+            title: 'Use Book',
+            description: 'Usar el libro de aperturas si está configurado',
+            default: true
         }
     },
     type: 'object',
@@ -150,12 +199,49 @@ export const BotMoveResponseSchema = {
             title: 'Message'
         },
         execution_time: {
-            type: 'number',
+            anyOf: [
+                {
+                    type: 'number'
+                },
+                {
+                    type: 'null'
+                }
+            ],
             title: 'Execution Time'
         },
+        cpu_time: {
+            anyOf: [
+                {
+                    type: 'number'
+                },
+                {
+                    type: 'null'
+                }
+            ],
+            title: 'Cpu Time'
+        },
         memory_peak_mb: {
-            type: 'number',
+            anyOf: [
+                {
+                    type: 'number'
+                },
+                {
+                    type: 'null'
+                }
+            ],
             title: 'Memory Peak Mb'
+        },
+        search_stats: {
+            anyOf: [
+                {
+                    additionalProperties: true,
+                    type: 'object'
+                },
+                {
+                    type: 'null'
+                }
+            ],
+            title: 'Search Stats'
         }
     },
     type: 'object',
@@ -620,6 +706,12 @@ export const HTTPValidationErrorSchema = {
     title: 'HTTPValidationError'
 } as const;
 
+export const MeasureLevelSchema = {
+    type: 'string',
+    enum: ['off', 'time', 'memory'],
+    title: 'MeasureLevel'
+} as const;
+
 export const MessageSchema = {
     properties: {
         message: {
@@ -654,6 +746,18 @@ export const MonteCarloParamsSchema = {
             title: 'Time Limit',
             description: 'Tiempo límite en segundos',
             default: 4.5
+        },
+        ponder: {
+            type: 'boolean',
+            title: 'Ponder',
+            description: 'Pensar la respuesta mientras juega el humano',
+            default: false
+        },
+        use_book: {
+            type: 'boolean',
+            title: 'Use Book',
+            description: 'Usar el libro de aperturas si está configurado',
+            default: true
         }
     },
     type: 'object',
@@ -718,6 +822,17 @@ export const MovesSchema = {
             ],
             title: 'Execution Time'
         },
+        cpu_time: {
+            anyOf: [
+                {
+                    type: 'number'
+                },
+                {
+                    type: 'null'
+                }
+            ],
+            title: 'Cpu Time'
+        },
         memory_used: {
             anyOf: [
                 {
@@ -728,6 +843,18 @@ export const MovesSchema = {
                 }
             ],
             title: 'Memory Used'
+        },
+        search_stats: {
+            anyOf: [
+                {
+                    additionalProperties: true,
+                    type: 'object'
+                },
+                {
+                    type: 'null'
+                }
+            ],
+            title: 'Search Stats'
         }
     },
     type: 'object',
@@ -1028,6 +1155,10 @@ export const SimulationRequestSchema = {
                     random: '#/components/schemas/ConfigRandom'
                 }
             }
+        },
+        measure: {
+            '$ref': '#/components/schemas/MeasureLevel',
+            default: 'time'
         }
     },
     type: 'object',
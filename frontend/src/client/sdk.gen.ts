@@ -140,9 +140,11 @@ export class GamesService {
     
     /**
      * Make Bot Move
-     * Make a move in the game.
+     * Make a move in the game. ``measure`` chooses what is measured (memory
+     * tracing makes the search much slower).
      * @param data The data for the request.
      * @param data.gameId
+     * @param data.measure
      * @returns BotMoveResponse Successful Response
      * @throws ApiError
      */
@@ -153,6 +155,9 @@ export class GamesService {
             path: {
                 game_id: data.gameId
             },
+            query: {
+                measure: data.measure
+            },
             errors: {
                 422: 'Validation Error'
             }
@@ -11,7 +11,7 @@ export type AIConfig = {
     heuristic?: AIHeuristic;
 };
 
-export type AIHeuristic = 'static_weights' | 'mobility_based' | 'hybrid' | 'none';
+export type AIHeuristic = 'static_weights' | 'mobility_based' | 'hybrid' | 'pattern' | 'potential_mobility' | 'hybrid_frontier' | 'none';
 
 export type AlphaBetaParams = {
     /**
@@ -26,6 +26,34 @@ export type AlphaBetaParams = {
      * Tiempo límite por jugada
      */
     time_limit_ms?: (number | null);
+    /**
+     * Memoria de la tabla de transposición en MB (0 la desactiva). El servidor la limita a MAX_TT_MB
+     */
+    tt_size_mb?: number;
+    /**
+     * Búsqueda de variante principal (ventanas nulas)
+     */
+    use_pvs?: boolean;
+    /**
+     * Semiventana de aspiración con PVS (0 la desactiva)
+     */
+    aspiration_window?: number;
+    /**
+     * Casillas libres para resolver el final exacto (0 lo desactiva)
+     */
+    endgame_empties?: number;
+    /**
+     * Procesos para repartir la raíz desde la profundidad 2 (0 o 1 = búsqueda en serie). Cada iteración paga el envío de las jugadas a los procesos (y la primera vez, arrancarlos): con time_limit_ms cortos apenas compensa. El servidor lo limita a MAX_SEARCH_WORKERS
+     */
+    parallel_workers?: number;
+    /**
+     * Pensar la respuesta mientras juega el humano
+     */
+    ponder?: boolean;
+    /**
+     * Usar el libro de aperturas si está configurado
+     */
+    use_book?: boolean;
 };
 
 export type Body_login_login_access_token = {
@@ -41,8 +69,12 @@ export type BotMoveResponse = {
     game: GamePublic;
     move_made: (Array<(number)> | null);
     message: string;
-    execution_time: number;
-    memory_peak_mb: number;
+    execution_time: (number | null);
+    cpu_time?: (number | null);
+    memory_peak_mb: (number | null);
+    search_stats?: ({
+        [key: string]: unknown;
+    } | null);
 };
 
 export type ConfigAlphaBeta = {
@@ -128,6 +160,8 @@ export type HTTPValidationError = {
     detail?: Array<ValidationError>;
 };
 
+export type MeasureLevel = 'off' | 'time' | 'memory';
+
 export type Message = {
     message: string;
 };
@@ -145,6 +179,14 @@ export type MonteCarloParams = {
      * Tiempo límite en segundos
      */
     time_limit?: number;
+    /**
+     * Pensar la respuesta mientras juega el humano
+     */
+    ponder?: boolean;
+    /**
+     * Usar el libro de aperturas si está configurado
+     */
+    use_book?: boolean;
 };
 
 export type MoveCreate = {
@@ -158,7 +200,11 @@ export type Moves = {
     player: Turn;
     position?: (Array<unknown> | null);
     execution_time?: (number | null);
+    cpu_time?: (number | null);
     memory_used?: (number | null);
+    search_stats?: ({
+        [key: string]: unknown;
+    } | null);
 };
 
 export type NewPassword = {
@@ -228,6 +274,7 @@ export type SimulationRequest = {
     num_games?: number;
     bot_black: (ConfigAlphaBeta | ConfigMonteCarlo | ConfigQLearning | ConfigRandom);
     bot_white: (ConfigAlphaBeta | ConfigMonteCarlo | ConfigQLearning | ConfigRandom);
+    measure?: MeasureLevel;
 };
 
 export type SimulationsPublic = {
@@ -342,6 +389,7 @@ export type GamesHumanMoveResponse = (Game);
 
 export type GamesMakeBotMoveData = {
     gameId: string;
+    measure?: MeasureLevel;
 };
 
 export type GamesMakeBotMoveResponse = (BotMoveResponse);
@@ -97,6 +97,9 @@ export const AIParamsSelector: React.FC<AIParamsSelectorProps> = ({ onChange })
             <option value="static_weights">Mapa de Calor (Posicional)</option>
             <option value="mobility_based">Movilidad (Libertad)</option>
             <option value="hybrid">Híbrida (Posición + Movilidad)</option>
+            <option value="pattern">Patrones (Bordes y Esquinas)</option>
+            <option value="potential_mobility">Movilidad Potencial (Frontera)</option>
+            <option value="hybrid_frontier">Híbrida + Frontera</option>
           </select>
 
           {/* MENSAJES DE AYUDA CONTEXTUALES */}